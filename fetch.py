@@ -4,17 +4,28 @@ This version stores everything in your database and enables smart filtering
 """
 
 import asyncio
+import atexit
+import aiohttp
+import bisect
 import feedparser
 import asyncpg
+import numpy as np
+from cachetools import TTLCache
 from pgvector.asyncpg import register_vector
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-from playwright.async_api import async_playwright
+from contextlib import asynccontextmanager, suppress
+from typing import List, Optional, Dict, Any, Tuple, Union
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import hashlib
+from blake3 import blake3
 import logging
 import os
-import json
+import random
+import orjson
+import re
+import time
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from enum import Enum
@@ -26,6 +37,94 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Max inputs per OpenAI embeddings request
+EMBEDDING_BATCH_SIZE = 100
+
+# Returned when the embeddings API fails
+EMBEDDING_DIMENSIONS = 1536
+DEFAULT_EMBEDDING = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+DEFAULT_EMBEDDING.flags.writeable = False
+
+# Also look up embedding_cache rows keyed by the pre-BLAKE3 MD5 hash, backfilling
+# them under the new key. Set EMBEDDING_CACHE_LEGACY_MD5=false once migrated.
+EMBEDDING_CACHE_LEGACY_MD5 = os.getenv("EMBEDDING_CACHE_LEGACY_MD5", "true").lower() == "true"
+
+UPSERT_CONTENT_SQL = """
+    INSERT INTO content_items 
+    (id, source, source_url, title, content, author, published,
+     primary_category, content_type, word_count, reading_time_minutes,
+     embedding, relevance_score, complexity_score, source_metadata,
+     scraped_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
+    ON CONFLICT (id) DO UPDATE SET
+        embedding = EXCLUDED.embedding,
+        relevance_score = EXCLUDED.relevance_score,
+        source_metadata = EXCLUDED.source_metadata,
+        updated_at = NOW()
+"""
+
+# IDs already sent to Notion, skipped by get_high_quality_content
+NOTION_SENT_DDL = """
+    CREATE TABLE IF NOT EXISTS notion_sent (
+        id TEXT PRIMARY KEY,
+        sent_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+# Column type ('vector' or 'halfvec') of a table's embedding column
+EMBEDDING_TYPE_SQL = """
+    SELECT udt_name FROM information_schema.columns
+    WHERE table_schema = 'public' AND table_name = $1 AND column_name = 'embedding'
+"""
+
+# Prepared statements cached per connection. Set to 0 when connecting through a
+# transaction-mode pooler (e.g. Supabase on port 6543), which can't keep them.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """HNSW build (m, ef_construction) and query (ef_search) parameters for a corpus size
+    
+    Small corpora keep the graph sparse so builds stay fast; large ones need a
+    denser graph and a wider search to keep recall up.
+    """
+    if vector_count < 100_000:
+        return {'m': 16, 'ef_construction': 64, 'ef_search': 40}
+    if vector_count < 1_000_000:
+        return {'m': 24, 'ef_construction': 100, 'ef_search': 100}
+    return {'m': 32, 'ef_construction': 128, 'ef_search': 200}
+
+# Text to embed: a string, or a tuple of fragments (e.g. title, content) that
+# stand for the fragments joined by single spaces, without building that string
+EmbeddingText = Union[str, Tuple[str, ...]]
+
+def _hash_fragments(hasher, text: EmbeddingText):
+    """Feed text into hasher fragment by fragment, as if joined by spaces"""
+    fragments = (text,) if isinstance(text, str) else text
+    for i, fragment in enumerate(fragments):
+        if i:
+            hasher.update(b" ")
+        hasher.update(fragment.encode())
+    return hasher
+
+def _text_hash(text: EmbeddingText) -> str:
+    """Cache key for a piece of text (BLAKE3, not used cryptographically)"""
+    return _hash_fragments(blake3(), text).hexdigest(length=16)
+
+def _embedding_input(text: EmbeddingText, limit: int = 8000) -> str:
+    """API input for text, truncated to limit characters before joining fragments"""
+    if isinstance(text, str):
+        return text[:limit]
+    pieces = []
+    remaining = limit
+    for i, fragment in enumerate(text):
+        if i:
+            pieces.append(" ")
+            remaining -= 1
+        piece = fragment[:max(remaining, 0)]
+        pieces.append(piece)
+        remaining -= len(piece)
+    return "".join(pieces)[:limit]
+
 class ContentCategory(Enum):
     """Content categories for intelligent filtering"""
     TECH_AI = "tech_ai"
@@ -36,17 +135,103 @@ class ContentCategory(Enum):
     BUSINESS = "business"
     PERSONAL = "personal"
 
+def _as_embedding(value) -> np.ndarray:
+    """Embedding as a float32 array, from an API list or a pgvector Vector"""
+    if hasattr(value, 'to_numpy'):
+        value = value.to_numpy()
+    return np.asarray(value, dtype=np.float32)
+
+def _fail_future(fut: asyncio.Future, exc: Exception):
+    """Fail fut with exc for its waiters, marking the exception as retrieved
+    
+    Waiters fall back to the default embedding on an Exception; cancelling
+    fut instead would raise CancelledError in every one of them.
+    """
+    fut.set_exception(exc)
+    fut.exception()  # asyncio would otherwise log it if nobody was waiting
+
+def _entry_field(entry, *names, default=""):
+    """First truthy attribute of a feedparser entry among names, else default"""
+    for name in names:
+        value = getattr(entry, name, None)
+        if value:
+            return value
+    return default
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one case-insensitive pattern (matches substrings, like `in`)"""
+    return re.compile('|'.join(re.escape(word) for word in keywords), re.IGNORECASE)
+
+# Keyword sets for scoring and categorization, compiled once at import
+QUALITY_PATTERN = _keyword_pattern(['breakthrough', 'research', 'analysis', 'report', 'study', 'development'])
+NOISE_PATTERN = _keyword_pattern(['promo', 'discount', 'webinar', 'limited time', 'buy now', 'click here'])
+CREDIBLE_DOMAIN_PATTERN = _keyword_pattern(['techcrunch', 'wired', 'reuters', 'bloomberg'])
+
+# Text cleanup for scraped content
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+WORD_PATTERN = re.compile(r'\S+')
+
+# Content type by word count: <100 short, <1500 medium, otherwise long
+CONTENT_TYPE_LIMITS = (100, 1500)
+CONTENT_TYPES = ("short", "medium", "long")
+
+# Requests the Twitter scraper never needs to render tweet text
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_HOSTS = (
+    'doubleclick.net', 'google-analytics.com', 'googletagmanager.com',
+    'googlesyndication.com', 'ads-twitter.com', 'analytics.twitter.com'
+)
+
+# Extracts {text, metrics} for every tweet on the page in a single evaluate call
+EXTRACT_TWEETS_JS = r"""
+() => Array.from(document.querySelectorAll('[data-testid="tweet"]'), tweet => {
+    const textElement = tweet.querySelector('[data-testid="tweetText"]');
+    const metrics = {};
+    tweet.querySelectorAll('[data-testid*="like"], [data-testid*="retweet"], [data-testid*="reply"]').forEach(metric => {
+        const label = metric.getAttribute('aria-label');
+        const number = label && label.match(/\d+/);
+        if (!number) return;
+        const lower = label.toLowerCase();
+        if (lower.includes('like')) metrics.likes = parseInt(number[0], 10);
+        else if (lower.includes('retweet')) metrics.retweets = parseInt(number[0], 10);
+        else if (lower.includes('repl')) metrics.replies = parseInt(number[0], 10);
+    });
+    return {text: textElement ? textElement.innerText : null, metrics};
+})
+"""
+
+# Checked in order; the first category with a match wins
+TWEET_CATEGORY_PATTERNS = [
+    (ContentCategory.TECH_AI, _keyword_pattern(['gpt', 'ai', 'ml', 'artificial intelligence', 'neural', 'llm'])),
+    (ContentCategory.CRYPTO, _keyword_pattern(['bitcoin', 'crypto', 'defi', 'ethereum', 'blockchain'])),
+    (ContentCategory.POLITICS, _keyword_pattern(['congress', 'senate', 'policy', 'legislation', 'government'])),
+    (ContentCategory.REGULATION, _keyword_pattern(['sec', 'regulation', 'compliance', 'federal'])),
+]
+FEED_URL_CATEGORY_PATTERNS = [
+    (ContentCategory.TECH_AI, _keyword_pattern(['techcrunch', 'wired', 'arstechnica'])),
+    (ContentCategory.CRYPTO, _keyword_pattern(['coindesk', 'cointelegraph'])),
+]
+FEED_CATEGORY_PATTERNS = [
+    (ContentCategory.TECH_AI, _keyword_pattern(['ai', 'artificial intelligence', 'machine learning'])),
+    (ContentCategory.CRYPTO, _keyword_pattern(['bitcoin', 'cryptocurrency', 'blockchain'])),
+]
+
 @dataclass
 class FetcherConfig:
     """Configuration for fetchers"""
     headless: bool = True
     max_concurrent: int = 3
     request_delay: float = 1.0
-    browser_timeout: int = 15000
+    browser_timeout: int = 10000
     max_scroll_attempts: int = 8
     max_retries: int = 2
+    embedding_cache_size: int = 20_000
+    embedding_cache_ttl: int = 86400  # seconds
+    embedding_failure_ttl: int = 60  # seconds before retrying a failed text
+    feedback_refresh_interval: int = 300  # seconds before rated embeddings are reloaded
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedContentItem:
     """Enhanced content item with database integration"""
     id: str
@@ -68,7 +253,7 @@ class EnhancedContentItem:
     reading_time_minutes: int = 1
     
     # AI-generated data (will be populated)
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None
     relevance_score: float = 0.5
     complexity_score: float = 0.5
     sentiment: Optional[str] = None
@@ -82,196 +267,432 @@ class EnhancedContentItem:
     def __post_init__(self):
         """Generate ID and calculate basic metrics"""
         if not self.id:
-            content_hash = hashlib.md5(
+            content_hash = blake3(
                 f"{self.source}{self.author}{self.content}".encode()
-            ).hexdigest()
-            self.id = f"{self.source}_{self.author}_{content_hash[:8]}"
+            ).hexdigest(length=4)
+            self.id = f"{self.source}_{self.author}_{content_hash}"
         
-        # Calculate word count and reading time
+        # Calculate word count (without building a list of words) and reading time
         if not self.word_count:
-            self.word_count = len(self.content.split())
+            self.word_count = sum(1 for _ in WORD_PATTERN.finditer(self.content))
         
         if not self.reading_time_minutes or self.reading_time_minutes == 1:
             self.reading_time_minutes = max(1, self.word_count // 200)
         
         # Determine content type
-        if self.word_count < 100:
-            self.content_type = "short"
-        elif self.word_count < 1500:
-            self.content_type = "medium"
-        else:
-            self.content_type = "long"
+        self.content_type = CONTENT_TYPES[bisect.bisect_right(CONTENT_TYPE_LIMITS, self.word_count)]
+
+# Tables with an embedding column
+EMBEDDING_TABLES = ('content_items', 'embedding_cache')
+
+async def migrate_embeddings_to_halfvec(conn) -> str:
+    """Convert stored embeddings from vector (fp32) to halfvec (fp16)
+    
+    Halves the bytes every similarity query streams. Writes need no change:
+    the pgvector codec encodes arrays for whichever type the column has.
+    Drop any index on the embedding columns first and recreate it with the
+    halfvec operator class afterwards. Returns content_items' embedding type.
+    """
+    for table in EMBEDDING_TABLES:
+        if await conn.fetchval(EMBEDDING_TYPE_SQL, table) == 'vector':
+            logger.info(f"Converting {table}.embedding to halfvec...")
+            await conn.execute(f"""
+                ALTER TABLE {table}
+                ALTER COLUMN embedding TYPE halfvec({EMBEDDING_DIMENSIONS})
+                USING embedding::halfvec({EMBEDDING_DIMENSIONS})
+            """)
+    
+    return await conn.fetchval(EMBEDDING_TYPE_SQL, 'content_items')
 
 class DatabaseManager:
     """Manages all database operations with Supabase"""
     
-    def __init__(self):
+    def __init__(self, config: FetcherConfig = None):
+        self.config = config or FetcherConfig()
         self.db_pool = None
+        self.embedding_type = None
         self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self._embedding_cache = {}
+        self._embedding_cache = TTLCache(
+            maxsize=self.config.embedding_cache_size, ttl=self.config.embedding_cache_ttl
+        )
+        self._embedding_failures = TTLCache(
+            maxsize=self.config.embedding_cache_size, ttl=self.config.embedding_failure_ttl
+        )
+        self.embedding_failures = 0  # times DEFAULT_EMBEDDING was returned
+        self._embedding_inflight: Dict[str, asyncio.Future] = {}
+        
+        # Embeddings of user-rated items, for in-process relevance scoring
+        self._feedback_vectors = np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        self._feedback_sq_norms = np.empty(0, dtype=np.float32)
+        self._feedback_positive = np.empty(0, dtype=np.float32)
+        self._feedback_loaded_at = float('-inf')  # time.monotonic() of the last load
     
     async def initialize(self):
         """Initialize database connection"""
         try:
+            # Register vector type on every pooled connection as it is opened
             self.db_pool = await asyncpg.create_pool(
                 os.getenv("SUPABASE_DB_URL"),
                 min_size=2,
-                max_size=10
+                max_size=max(10, self.config.max_concurrent * 2),
+                init=register_vector,
+                statement_cache_size=DB_STATEMENT_CACHE_SIZE
             )
             
-            # Register vector type
-            async with self.db_pool.acquire() as conn:
-                await register_vector(conn)
+            async with self.pool_conn() as conn:
+                await conn.execute(NOTION_SENT_DDL)
+                self.embedding_type = await conn.fetchval(EMBEDDING_TYPE_SQL, 'content_items')
+            await self.refresh_feedback_vectors()
             
-            logger.info("✅ Database connection established")
+            logger.info(f"✅ Database connection established (embeddings stored as {self.embedding_type})")
             
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}")
             raise
     
-    async def get_embedding(self, text: str) -> List[float]:
+    async def migrate_embeddings_to_halfvec(self, conn=None):
+        """Convert stored embeddings to halfvec; see the module-level function"""
+        async with self.pool_conn(conn) as conn:
+            self.embedding_type = await migrate_embeddings_to_halfvec(conn)
+    
+    async def refresh_feedback_vectors(self, conn=None):
+        """Load embeddings of all user-rated items into memory"""
+        async with self.pool_conn(conn) as conn:
+            rows = await conn.fetch("""
+                SELECT embedding, user_feedback FROM content_items
+                WHERE user_feedback IS NOT NULL AND embedding IS NOT NULL
+            """)
+        
+        if rows:
+            self._feedback_vectors = np.stack([_as_embedding(row['embedding']) for row in rows])
+            self._feedback_positive = np.array([row['user_feedback'] > 0 for row in rows], dtype=np.float32)
+        else:
+            self._feedback_vectors = np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+            self._feedback_positive = np.empty(0, dtype=np.float32)
+        self._feedback_sq_norms = np.einsum('ij,ij->i', self._feedback_vectors, self._feedback_vectors)
+        self._feedback_loaded_at = time.monotonic()
+        
+        logger.info(f"Loaded {len(rows)} rated embeddings for relevance scoring")
+    
+    async def _refresh_stale_feedback(self, conn=None):
+        """Reload rated embeddings if feedback_refresh_interval has passed since the last load"""
+        now = time.monotonic()
+        if now - self._feedback_loaded_at < self.config.feedback_refresh_interval:
+            return
+        
+        # Claim the refresh up front so concurrent batches don't all reload
+        self._feedback_loaded_at = now
+        try:
+            await self.refresh_feedback_vectors(conn)
+        except Exception as e:
+            logger.warning(f"Failed to refresh rated embeddings, keeping the old ones: {e}")
+    
+    @asynccontextmanager
+    async def pool_conn(self, conn=None):
+        """Yield conn if given, otherwise a connection acquired from the pool"""
+        if conn is not None:
+            yield conn
+        else:
+            async with self.db_pool.acquire() as conn:
+                yield conn
+    
+    async def get_embedding(self, text: EmbeddingText) -> np.ndarray:
         """Get OpenAI embedding with caching"""
         # Create cache key
-        text_hash = hashlib.md5(text.encode()).hexdigest()
+        key = _text_hash(text)
         
         # Check in-memory cache first
-        if text_hash in self._embedding_cache:
-            return self._embedding_cache[text_hash]
+        if key in self._embedding_cache:
+            return self._embedding_cache[key]
+        
+        # Don't retry the API for a text that just failed
+        if key in self._embedding_failures:
+            return self._default_embedding()
         
         # Check database cache
-        async with self.db_pool.acquire() as conn:
-            cached = await conn.fetchval("""
-                SELECT embedding FROM embedding_cache WHERE text_hash = $1
-            """, text_hash)
+        async with self.pool_conn() as conn:
+            cached = await self._fetch_cached_embeddings(conn, [text], [key])
             
-            if cached:
-                self._embedding_cache[text_hash] = cached
-                return cached
+            if key in cached:
+                self._embedding_cache[key] = cached[key]
+                return cached[key]
+        
+        # Share one API call between concurrent requests for the same text
+        fut = self._embedding_inflight.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._embedding_inflight[key] = fut
+            try:
+                fut.set_result(await self._create_embedding(text, key))
+            except Exception as e:
+                _fail_future(fut, e)
+            finally:
+                del self._embedding_inflight[key]
+                if not fut.done():
+                    _fail_future(fut, RuntimeError("Embedding request was cancelled"))
         
-        # Generate new embedding
         try:
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text[:8000]  # Truncate if too long
-            )
-            
-            embedding = response.data[0].embedding
-            
-            # Cache in database and memory
-            async with self.db_pool.acquire() as conn:
+            return await asyncio.shield(fut)
+        except Exception as e:
+            logger.error(f"Failed to generate embedding: {e}")
+            # Return a default embedding if API fails
+            self._embedding_failures[key] = True
+            return self._default_embedding()
+    
+    def _default_embedding(self) -> np.ndarray:
+        """Count and return the fallback embedding used when the API fails"""
+        self.embedding_failures += 1
+        return DEFAULT_EMBEDDING
+    
+    async def _create_embedding(self, text: EmbeddingText, key: str) -> np.ndarray:
+        """Generate a new embedding and cache it in database and memory"""
+        response = await self.openai_client.embeddings.create(
+            model="text-embedding-3-small",
+            input=_embedding_input(text)  # Truncate if too long
+        )
+        
+        embedding = _as_embedding(response.data[0].embedding)
+        self._embedding_cache[key] = embedding
+        
+        try:
+            async with self.pool_conn() as conn:
                 await conn.execute("""
                     INSERT INTO embedding_cache (text_hash, embedding)
                     VALUES ($1, $2)
                     ON CONFLICT (text_hash) DO NOTHING
-                """, text_hash, embedding)
-            
-            self._embedding_cache[text_hash] = embedding
-            return embedding
-            
+                """, key, embedding)
         except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            # Return a default embedding if API fails
-            return [0.0] * 1536
+            # The embedding is still good; it just won't be cached across runs
+            logger.warning(f"Failed to cache embedding: {e}")
+        
+        return embedding
+    
+    async def _fetch_cached_embeddings(self, conn, texts: List[EmbeddingText], keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up embedding_cache rows for texts, returning {key: embedding} for hits"""
+        lookup_keys = list(keys)
+        if EMBEDDING_CACHE_LEGACY_MD5:
+            legacy_keys = [_hash_fragments(hashlib.md5(), text).hexdigest() for text in texts]
+            lookup_keys += legacy_keys
+        
+        rows = await conn.fetch("""
+            SELECT text_hash, embedding FROM embedding_cache
+            WHERE text_hash = ANY($1::text[])
+        """, lookup_keys)
+        found = {row['text_hash']: _as_embedding(row['embedding']) for row in rows}
+        
+        cached = {key: found[key] for key in keys if key in found}
+        if EMBEDDING_CACHE_LEGACY_MD5:
+            # Backfill legacy hits under the new key
+            backfill = [(key, found[legacy]) for key, legacy in zip(keys, legacy_keys)
+                        if key not in cached and legacy in found]
+            if backfill:
+                await conn.executemany("""
+                    INSERT INTO embedding_cache (text_hash, embedding)
+                    VALUES ($1, $2)
+                    ON CONFLICT (text_hash) DO NOTHING
+                """, backfill)
+                cached.update(backfill)
+        
+        return cached
+    
+    async def get_embeddings(self, texts: List[EmbeddingText], conn=None) -> List[np.ndarray]:
+        """Get OpenAI embeddings for many texts, sending cache misses in batches"""
+        hashes = [_text_hash(text) for text in texts]
+        embeddings = [self._embedding_cache.get(key) for key in hashes]
+        
+        # Don't retry the API for texts that just failed
+        for i, key in enumerate(hashes):
+            if embeddings[i] is None and key in self._embedding_failures:
+                embeddings[i] = self._default_embedding()
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        if not missing:
+            return embeddings
+        
+        # Check database cache for everything the memory cache missed
+        async with self.pool_conn(conn) as db_conn:
+            cached = await self._fetch_cached_embeddings(
+                db_conn, [texts[i] for i in missing], [hashes[i] for i in missing]
+            )
+        
+        # Join requests already in flight (including repeats within this batch),
+        # and register futures for the texts this call will request itself
+        loop = asyncio.get_running_loop()
+        futures = {}
+        to_request = []
+        for i in missing:
+            if hashes[i] in cached:
+                embeddings[i] = cached[hashes[i]]
+                self._embedding_cache[hashes[i]] = embeddings[i]
+            elif hashes[i] in self._embedding_inflight:
+                futures[i] = self._embedding_inflight[hashes[i]]
+            else:
+                futures[i] = self._embedding_inflight[hashes[i]] = loop.create_future()
+                to_request.append(i)
+        
+        try:
+            # Generate the rest, up to EMBEDDING_BATCH_SIZE inputs per request
+            new_rows = []
+            for start in range(0, len(to_request), EMBEDDING_BATCH_SIZE):
+                batch = to_request[start:start + EMBEDDING_BATCH_SIZE]
+                try:
+                    response = await self.openai_client.embeddings.create(
+                        model="text-embedding-3-small",
+                        input=[_embedding_input(texts[i]) for i in batch]  # Truncate if too long
+                    )
+                    
+                    for i, data in zip(batch, response.data):
+                        embedding = _as_embedding(data.embedding)
+                        self._embedding_cache[hashes[i]] = embedding
+                        futures[i].set_result(embedding)
+                        new_rows.append((hashes[i], embedding))
+                        
+                except Exception as e:
+                    logger.error(f"Failed to generate {len(batch)} embeddings: {e}")
+                    for i in batch:
+                        if not futures[i].done():
+                            _fail_future(futures[i], e)
+            
+            # Cache new embeddings in database
+            if new_rows:
+                try:
+                    async with self.pool_conn(conn) as db_conn:
+                        await db_conn.executemany("""
+                            INSERT INTO embedding_cache (text_hash, embedding)
+                            VALUES ($1, $2)
+                            ON CONFLICT (text_hash) DO NOTHING
+                        """, new_rows)
+                except Exception as e:
+                    # The embeddings are still good; they just won't be cached across runs
+                    logger.warning(f"Failed to cache {len(new_rows)} embeddings: {e}")
+        finally:
+            # Texts the API skipped (short response) or never reached (cancellation)
+            for i in to_request:
+                self._embedding_inflight.pop(hashes[i], None)
+                if not futures[i].done():
+                    _fail_future(futures[i], RuntimeError("No embedding was returned for this text"))
+        
+        for i, fut in futures.items():
+            try:
+                embeddings[i] = await asyncio.shield(fut)
+            except Exception:
+                # Return a default embedding if API fails
+                self._embedding_failures[hashes[i]] = True
+                embeddings[i] = self._default_embedding()
+        
+        return embeddings
     
     async def store_content_item(self, item: EnhancedContentItem) -> bool:
         """Store a single content item with embedding"""
+        return await self.store_content_items([item])
+    
+    async def store_content_items(self, items: List[EnhancedContentItem]) -> bool:
+        """Store a batch of content items with embeddings in one transaction"""
+        if not items:
+            return True
+        
         try:
-            # Generate embedding for the content
-            embedding_text = f"{item.title} {item.content}"
-            item.embedding = await self.get_embedding(embedding_text)
-            
-            # Calculate initial relevance score (basic for now)
-            item.relevance_score = await self._calculate_initial_relevance(item)
-            
-            # Store in database
-            async with self.db_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO content_items 
-                    (id, source, source_url, title, content, author, published,
-                     primary_category, content_type, word_count, reading_time_minutes,
-                     embedding, relevance_score, complexity_score, source_metadata,
-                     scraped_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
-                    ON CONFLICT (id) DO UPDATE SET
-                        embedding = EXCLUDED.embedding,
-                        relevance_score = EXCLUDED.relevance_score,
-                        source_metadata = EXCLUDED.source_metadata,
-                        updated_at = NOW()
-                """, 
-                item.id, item.source, item.source_url, item.title, item.content,
-                item.author, item.published,
-                item.primary_category.value if item.primary_category else None,
-                item.content_type, item.word_count, item.reading_time_minutes,
-                item.embedding, item.relevance_score, item.complexity_score,
-                json.dumps(item.source_metadata), item.scraped_at)
+            # One connection for cache lookups, relevance queries and the write
+            async with self.pool_conn() as conn:
+                # Generate embeddings for the whole batch, once per distinct text
+                by_text: Dict[Tuple[str, str], List[EnhancedContentItem]] = {}
+                for item in items:
+                    by_text.setdefault((item.title, item.content), []).append(item)
+                
+                embeddings = await self.get_embeddings(list(by_text), conn=conn)
+                for same_text_items, embedding in zip(by_text.values(), embeddings):
+                    for item in same_text_items:
+                        item.embedding = embedding
+                
+                # Ratings keep arriving while a long-lived manager is in use
+                await self._refresh_stale_feedback(conn)
+                
+                rows = []
+                for item in items:
+                    # Calculate initial relevance score (basic for now)
+                    item.relevance_score = self._calculate_initial_relevance(item)
+                    
+                    rows.append(self._content_row(item))
+                
+                # Store in database; executemany reuses the connection's cached upsert statement
+                async with conn.transaction():
+                    await conn.executemany(UPSERT_CONTENT_SQL, rows)
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to store item {item.id}: {e}")
+            logger.error(f"Failed to store {len(items)} items: {e}")
             return False
     
-    async def _calculate_initial_relevance(self, item: EnhancedContentItem) -> float:
+    @staticmethod
+    def _content_row(item: EnhancedContentItem) -> tuple:
+        """Row tuple for content_items, in UPSERT_CONTENT_SQL column order"""
+        return (
+            item.id, item.source, item.source_url, item.title, item.content,
+            item.author, item.published,
+            item.primary_category.value if item.primary_category else None,
+            item.content_type, item.word_count, item.reading_time_minutes,
+            item.embedding, item.relevance_score, item.complexity_score,
+            orjson.dumps(item.source_metadata).decode() if item.source_metadata else '{}',
+            item.scraped_at
+        )
+    
+    def _calculate_initial_relevance(self, item: EnhancedContentItem) -> float:
         """Calculate initial relevance score based on content and historical data"""
         try:
-            async with self.db_pool.acquire() as conn:
-                # Check for similar content that was rated highly
-                if item.embedding:
-                    similar_ratings = await conn.fetch("""
-                        SELECT user_feedback, (embedding <-> $1) as distance
-                        FROM content_items 
-                        WHERE user_feedback IS NOT NULL
-                        AND (embedding <-> $1) < 0.3
-                        ORDER BY distance
-                        LIMIT 5
-                    """, item.embedding)
-                    
-                    if similar_ratings:
-                        # Weight by similarity
-                        total_weight = 0
-                        total_score = 0
-                        
-                        for row in similar_ratings:
-                            weight = 1.0 - row['distance']  # Closer = higher weight
-                            score = 1.0 if row['user_feedback'] > 0 else 0.0
-                            total_weight += weight
-                            total_score += score * weight
-                        
-                        if total_weight > 0:
-                            return total_score / total_weight
-                
-                # Fallback: basic content analysis
-                return self._basic_content_scoring(item)
-                
+            # Check for similar content that was rated highly, against the in-memory
+            # matrix that _refresh_stale_feedback keeps current
+            if item.embedding is not None and len(self._feedback_vectors):
+                # Weight by similarity (closer = higher weight)
+                score = self._feedback_relevance(item.embedding)
+                if score is not None:
+                    return float(score)
+            
+            # Fallback: basic content analysis
+            return self._basic_content_scoring(item)
+            
         except Exception as e:
             logger.error(f"Error calculating relevance: {e}")
             return 0.5
     
-    def _basic_content_scoring(self, item: EnhancedContentItem) -> float:
-        """Basic content scoring based on keywords and patterns"""
-        content_lower = item.content.lower()
-        title_lower = item.title.lower()
+    def _feedback_relevance(self, embedding: np.ndarray) -> Optional[float]:
+        """Similarity-weighted share of positive feedback among the 5 nearest rated items
+        
+        None if no rated item is within an L2 distance of 0.3.
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        
+        # L2 distance to every rated item in one matrix-vector product
+        sq_distances = self._feedback_sq_norms - 2.0 * (self._feedback_vectors @ query) + query @ query
+        distances = np.sqrt(np.maximum(sq_distances, 0.0))
         
-        # Quality indicators
-        quality_boost = 0.0
-        noise_penalty = 0.0
+        # 5 nearest among those closer than 0.3
+        close = np.flatnonzero(distances < 0.3)
+        if close.size == 0:
+            return None
+        if close.size > 5:
+            close = close[np.argpartition(distances[close], 5)[:5]]
         
-        # Positive signals
-        quality_words = ['breakthrough', 'research', 'analysis', 'report', 'study', 'development']
-        for word in quality_words:
-            if word in content_lower:
-                quality_boost += 0.1
+        weights = 1.0 - distances[close]
+        total_weight = weights.sum()
+        if total_weight <= 0:
+            return None
+        return float((weights * self._feedback_positive[close]).sum() / total_weight)
+    
+    def _basic_content_scoring(self, item: EnhancedContentItem) -> float:
+        """Basic content scoring based on keywords and patterns"""
+        # Positive signals: +0.1 per distinct quality word
+        quality_words = {match.group().lower() for match in QUALITY_PATTERN.finditer(item.content)}
+        quality_boost = 0.1 * len(quality_words)
         
         # Author credibility (basic check)
-        credible_domains = ['techcrunch', 'wired', 'reuters', 'bloomberg']
-        if any(domain in item.source_url.lower() for domain in credible_domains):
+        if CREDIBLE_DOMAIN_PATTERN.search(item.source_url):
             quality_boost += 0.2
         
-        # Noise signals
-        noise_words = ['promo', 'discount', 'webinar', 'limited time', 'buy now', 'click here']
-        for word in noise_words:
-            if word in content_lower:
-                noise_penalty += 0.2
+        # Noise signals: -0.2 per distinct noise phrase
+        noise_words = {match.group().lower() for match in NOISE_PATTERN.finditer(item.content)}
+        noise_penalty = 0.2 * len(noise_words)
         
         # Calculate final score
         base_score = 0.5
@@ -280,19 +701,27 @@ class DatabaseManager:
         return max(0.1, min(1.0, final_score))
     
     async def get_high_quality_content(self, hours: int = 24, min_score: float = 0.7, limit: int = 50) -> List[Dict]:
-        """Get high-quality content from the last N hours"""
+        """Get high-quality content from the last N hours not yet sent to Notion
+        
+        Expects the index (notion_sent is created by initialize()):
+            CREATE INDEX IF NOT EXISTS content_items_scraped_relevance_idx
+            ON content_items (scraped_at DESC, relevance_score DESC);
+        """
         try:
-            async with self.db_pool.acquire() as conn:
+            async with self.pool_conn() as conn:
+                # Anti-join on notion_sent's primary key drops items already sent
                 results = await conn.fetch("""
-                    SELECT id, source, title, content, author, published, 
-                           primary_category, relevance_score, source_url,
-                           reading_time_minutes, word_count, source_metadata
-                    FROM content_items 
-                    WHERE scraped_at > NOW() - INTERVAL '%d hours'
-                    AND relevance_score >= $1
-                    ORDER BY relevance_score DESC, published DESC
-                    LIMIT $2
-                """ % hours, min_score, limit)
+                    SELECT c.id, c.source, c.title, c.content, c.author, c.published, 
+                           c.primary_category, c.relevance_score, c.source_url,
+                           c.reading_time_minutes, c.word_count, c.source_metadata
+                    FROM content_items c
+                    LEFT JOIN notion_sent s ON s.id = c.id
+                    WHERE c.scraped_at > NOW() - $1::float8 * interval '1 hour'
+                    AND c.relevance_score >= $2
+                    AND s.id IS NULL
+                    ORDER BY c.relevance_score DESC, c.published DESC
+                    LIMIT $3
+                """, hours, min_score, limit)
                 
                 return [dict(row) for row in results]
                 
@@ -300,6 +729,23 @@ class DatabaseManager:
             logger.error(f"Error fetching high-quality content: {e}")
             return []
     
+    async def mark_sent_to_notion(self, ids: List[str]) -> bool:
+        """Record item IDs as sent, so get_high_quality_content skips them"""
+        if not ids:
+            return True
+        
+        try:
+            async with self.pool_conn() as conn:
+                await conn.executemany("""
+                    INSERT INTO notion_sent (id) VALUES ($1)
+                    ON CONFLICT (id) DO NOTHING
+                """, [(item_id,) for item_id in ids])
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to mark {len(ids)} items as sent: {e}")
+            return False
+    
     async def close(self):
         """Close database connection"""
         if self.db_pool:
@@ -311,64 +757,101 @@ class TwitterFetcher:
     def __init__(self, config: FetcherConfig = None, db_manager: DatabaseManager = None):
         self.config = config or FetcherConfig()
         self.db_manager = db_manager
+        self.playwright = None
         self.browser = None
-        self.context = None
+        self.contexts = []
+        self._page_pool: asyncio.Queue = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
         self._semaphore = asyncio.Semaphore(self.config.max_concurrent)
     
     async def _init_browser(self):
         """Initialize browser with anti-detection measures"""
-        if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
-                headless=self.config.headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--disable-web-security',
-                    '--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                ]
-            )
-            
-            self.context = await self.browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1280, 'height': 720},
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-                }
-            )
-            
-            await self.context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-            """)
+        async with self._browser_lock:
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                try:
+                    self.browser = await self.playwright.chromium.launch(
+                        headless=self.config.headless,
+                        args=[
+                            '--no-sandbox',
+                            '--disable-blink-features=AutomationControlled',
+                            '--disable-dev-shm-usage',
+                            '--disable-web-security',
+                            '--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                        ]
+                    )
+                    
+                    # One context per concurrent fetch so cookies and navigation don't
+                    # interfere, each with a page that is reused from user to user
+                    for _ in range(self.config.max_concurrent):
+                        context = await self._new_context()
+                        self.contexts.append(context)
+                        self._page_pool.put_nowait(await context.new_page())
+                except BaseException:
+                    # A half-built pool would leave later callers waiting forever
+                    # for a page; tear it down so the next caller starts over
+                    await self._reset_browser()
+                    raise
     
-    def _auto_categorize(self, content: str, author: str) -> ContentCategory:
-        """Auto-categorize content based on keywords and author"""
-        content_lower = content.lower()
-        author_lower = author.lower()
+    async def _reset_browser(self):
+        """Close whatever browser resources exist, ignoring errors, and forget them"""
+        while not self._page_pool.empty():
+            self._page_pool.get_nowait()
+        for context in self.contexts:
+            with suppress(Exception):
+                await context.close()
+        if self.browser:
+            with suppress(Exception):
+                await self.browser.close()
+        if self.playwright:
+            with suppress(Exception):
+                await self.playwright.stop()
+        self.contexts = []
+        self.browser = self.playwright = None
+    
+    async def _new_context(self):
+        """Create a browser context with anti-detection measures"""
+        context = await self.browser.new_context(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            viewport={'width': 1280, 'height': 720},
+            extra_http_headers={
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+            },
+            service_workers='block'  # Requests served by a worker would skip the route below
+        )
         
-        # AI/Tech keywords
-        if any(word in content_lower for word in ['gpt', 'ai', 'ml', 'artificial intelligence', 'neural', 'llm']):
-            return ContentCategory.TECH_AI
+        await context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+            Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+            Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+        """)
         
-        # Crypto keywords  
-        elif any(word in content_lower for word in ['bitcoin', 'crypto', 'defi', 'ethereum', 'blockchain']):
-            return ContentCategory.CRYPTO
+        # Skip images, video, fonts and ad/analytics traffic
+        await context.route("**/*", self._route_request)
         
-        # Politics keywords
-        elif any(word in content_lower for word in ['congress', 'senate', 'policy', 'legislation', 'government']):
-            return ContentCategory.POLITICS
+        return context
+    
+    @staticmethod
+    async def _route_request(route):
+        """Abort requests for heavyweight subresources and tracking hosts"""
+        request = route.request
+        host = urlsplit(request.url).hostname or ''
         
-        # Regulation keywords
-        elif any(word in content_lower for word in ['sec', 'regulation', 'compliance', 'federal']):
-            return ContentCategory.REGULATION
+        if (request.resource_type in BLOCKED_RESOURCE_TYPES
+                or any(host == blocked or host.endswith('.' + blocked) for blocked in BLOCKED_HOSTS)):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    def _auto_categorize(self, content: str, author: str) -> ContentCategory:
+        """Auto-categorize content based on keywords and author"""
+        for category, pattern in TWEET_CATEGORY_PATTERNS:
+            if pattern.search(content):
+                return category
         
         # Default to business
-        else:
-            return ContentCategory.BUSINESS
+        return ContentCategory.BUSINESS
     
     async def fetch_user_tweets(self, username: str, max_tweets: int = 20) -> List[EnhancedContentItem]:
         """Fetch tweets and store in database"""
@@ -378,7 +861,7 @@ class TwitterFetcher:
     async def _fetch_user_tweets_impl(self, username: str, max_tweets: int) -> List[EnhancedContentItem]:
         """Implementation of tweet fetching"""
         await self._init_browser()
-        page = await self.context.new_page()
+        page = await self._page_pool.get()
         items = []
         
         try:
@@ -390,7 +873,8 @@ class TwitterFetcher:
             page_loaded = False
             for url in urls_to_try:
                 try:
-                    await page.goto(url, wait_until='domcontentloaded', timeout=self.config.browser_timeout)
+                    # Only wait for the response to start; the tweet selector wait below does the rest
+                    await page.goto(url, wait_until='commit', timeout=self.config.browser_timeout)
                     page_loaded = True
                     break
                 except Exception as e:
@@ -401,10 +885,7 @@ class TwitterFetcher:
                 logger.warning(f"Could not load any URL for {username}")
                 return items
             
-            # Wait for content to load
-            await asyncio.sleep(3)
-            
-            # Look for tweet elements
+            # Look for tweet elements (waits until they render)
             tweet_selectors = [
                 '[data-testid="tweet"]',
                 'article[data-testid="tweet"]',
@@ -430,48 +911,22 @@ class TwitterFetcher:
             scroll_attempts = 0
             
             while tweet_count < max_tweets and scroll_attempts < self.config.max_scroll_attempts:
-                tweets = await page.query_selector_all('[data-testid="tweet"]')
+                # Read text and engagement metrics for every tweet in one round-trip
+                tweets = await page.evaluate(EXTRACT_TWEETS_JS)
                 
                 for tweet in tweets:
                     if tweet_count >= max_tweets:
                         break
                     
                     try:
-                        # Extract tweet text
-                        text_element = await tweet.query_selector('[data-testid="tweetText"]')
-                        if not text_element:
-                            continue
-                        
-                        text = await text_element.inner_text()
+                        text = tweet['text']
                         if not text or len(text.strip()) < 5:
                             continue
                         
                         # Avoid duplicates
-                        content_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-                        if content_hash in seen_content:
+                        if text in seen_content:
                             continue
-                        seen_content.add(content_hash)
-                        
-                        # Extract engagement metrics
-                        metadata = {}
-                        try:
-                            # Look for like/retweet buttons
-                            metrics = await tweet.query_selector_all('[data-testid*="like"], [data-testid*="retweet"], [data-testid*="reply"]')
-                            for metric in metrics:
-                                aria_label = await metric.get_attribute('aria-label')
-                                if aria_label:
-                                    # Extract numbers from aria-label
-                                    import re
-                                    numbers = re.findall(r'\d+', aria_label)
-                                    if numbers:
-                                        if 'like' in aria_label.lower():
-                                            metadata['likes'] = int(numbers[0])
-                                        elif 'retweet' in aria_label.lower():
-                                            metadata['retweets'] = int(numbers[0])
-                                        elif 'repl' in aria_label.lower():
-                                            metadata['replies'] = int(numbers[0])
-                        except:
-                            pass
+                        seen_content.add(text)
                         
                         # Create content item
                         item = EnhancedContentItem(
@@ -483,19 +938,12 @@ class TwitterFetcher:
                             author=username,
                             published=datetime.now(),  # Could extract actual date
                             primary_category=self._auto_categorize(text, username),
-                            source_metadata=metadata
+                            source_metadata=tweet['metrics']
                         )
                         
-                        # Store in database immediately
-                        if self.db_manager:
-                            success = await self.db_manager.store_content_item(item)
-                            if success:
-                                items.append(item)
-                                tweet_count += 1
-                                logger.debug(f"Stored tweet {tweet_count}: {text[:50]}...")
-                        else:
-                            items.append(item)
-                            tweet_count += 1
+                        items.append(item)
+                        tweet_count += 1
+                        logger.debug(f"Found tweet {tweet_count}: {text[:50]}...")
                         
                     except Exception as e:
                         logger.debug(f"Error processing tweet: {e}")
@@ -504,127 +952,158 @@ class TwitterFetcher:
                 if tweet_count >= max_tweets:
                     break
                 
-                # Scroll for more tweets
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await asyncio.sleep(2)
+                # Scroll for more tweets and wait until the page grows
+                height = await page.evaluate(
+                    '() => { const h = document.body.scrollHeight; window.scrollTo(0, h); return h; }'
+                )
+                try:
+                    await page.wait_for_function(
+                        'height => document.body.scrollHeight > height', arg=height, timeout=3000
+                    )
+                except PlaywrightTimeoutError:
+                    break  # Nothing more loaded
+                
+                # Small jitter so scrolling doesn't look automated
+                await asyncio.sleep(random.uniform(0.3, 0.8))
                 scroll_attempts += 1
             
+            # Store the whole batch in database
+            if self.db_manager and not await self.db_manager.store_content_items(items):
+                items = []
+            
             logger.info(f"✅ Fetched {len(items)} tweets from @{username}")
             
         except Exception as e:
             logger.error(f"Error fetching tweets from {username}: {e}")
         finally:
-            await page.close()
+            await self._release_page(page)
         
         return items
     
+    async def _release_page(self, page):
+        """Blank the page and put it back in the pool, replacing it if it broke"""
+        try:
+            await page.goto('about:blank')
+        except Exception as e:
+            logger.debug(f"Replacing broken page: {e}")
+            try:
+                await page.close()
+                page = await page.context.new_page()
+            except Exception:
+                pass  # Keep the slot; the next fetch on it reports the error
+        finally:
+            self._page_pool.put_nowait(page)
+    
     async def cleanup(self):
         """Clean up browser resources"""
-        if self.context:
-            await self.context.close()
+        for context in self.contexts:
+            await context.close()
         if self.browser:
             await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
 
 class RSSFetcher:
     """Enhanced RSS fetcher with database integration"""
     
-    def __init__(self, db_manager: DatabaseManager = None):
+    def __init__(self, db_manager: DatabaseManager = None, config: FetcherConfig = None,
+                 http: Optional[aiohttp.ClientSession] = None):
         self.db_manager = db_manager
+        self.config = config or FetcherConfig()
+        self.http = http  # feeds are downloaded through it when given, reusing its connections
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent)
     
     def _auto_categorize_feed(self, feed_url: str, entry_title: str, entry_content: str) -> ContentCategory:
         """Auto-categorize RSS content"""
-        text = f"{entry_title} {entry_content}".lower()
-        url_lower = feed_url.lower()
-        
         # Check URL first
-        if any(tech in url_lower for tech in ['techcrunch', 'wired', 'arstechnica']):
-            return ContentCategory.TECH_AI
-        elif any(crypto in url_lower for crypto in ['coindesk', 'cointelegraph']):
-            return ContentCategory.CRYPTO
+        for category, pattern in FEED_URL_CATEGORY_PATTERNS:
+            if pattern.search(feed_url):
+                return category
         
         # Check content
-        if any(word in text for word in ['ai', 'artificial intelligence', 'machine learning']):
-            return ContentCategory.TECH_AI
-        elif any(word in text for word in ['bitcoin', 'cryptocurrency', 'blockchain']):
-            return ContentCategory.CRYPTO
+        for category, pattern in FEED_CATEGORY_PATTERNS:
+            if pattern.search(entry_title) or pattern.search(entry_content):
+                return category
         
         return ContentCategory.BUSINESS
     
     async def fetch_feed_items(self, feed_url: str, max_items: int = 20) -> List[EnhancedContentItem]:
         """Fetch RSS feed items and store in database"""
+        async with self._semaphore:
+            return await self._fetch_feed_items_impl(feed_url, max_items)
+    
+    async def _fetch_feed_items_impl(self, feed_url: str, max_items: int) -> List[EnhancedContentItem]:
+        """Implementation of RSS fetching"""
         items = []
         
         try:
             logger.info(f"📰 Fetching RSS feed: {feed_url}")
             
-            feed = feedparser.parse(feed_url)
+            if self.http:
+                async with self.http.get(feed_url) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+                feed = await asyncio.to_thread(feedparser.parse, body)
+            else:
+                # feedparser downloads and parses synchronously, so keep it off the event loop
+                feed = await asyncio.to_thread(feedparser.parse, feed_url)
             
             if feed.bozo:
                 logger.warning(f"RSS feed has parsing issues: {feed.bozo_exception}")
             
-            for i, entry in enumerate(feed.entries[:max_items]):
+            feed_title = _entry_field(feed.feed, 'title')
+            _datetime = datetime
+            
+            for entry in feed.entries[:max_items]:
                 try:
                     # Parse date
-                    pub_date = datetime.now()
-                    for date_field in ['published_parsed', 'updated_parsed']:
-                        if hasattr(entry, date_field) and getattr(entry, date_field):
+                    pub_date = None
+                    for date_field in ('published_parsed', 'updated_parsed'):
+                        parsed = getattr(entry, date_field, None)
+                        if parsed:
                             try:
-                                pub_date = datetime(*getattr(entry, date_field)[:6])
+                                pub_date = _datetime(*parsed[:6])
                                 break
                             except (TypeError, ValueError):
                                 continue
+                    if pub_date is None:
+                        pub_date = _datetime.now()
                     
                     # Extract content
-                    content = ""
-                    if hasattr(entry, 'content') and entry.content:
-                        content = entry.content[0].value
-                    elif hasattr(entry, 'summary'):
-                        content = entry.summary
-                    elif hasattr(entry, 'description'):
-                        content = entry.description
+                    entry_content = _entry_field(entry, 'content')
+                    content = entry_content[0].value if entry_content else _entry_field(entry, 'summary', 'description')
                     
                     # Clean HTML
-                    import re
-                    content = re.sub(r'<[^>]+>', '', content)
-                    content = re.sub(r'\s+', ' ', content).strip()
+                    content = HTML_TAG_PATTERN.sub('', content)
+                    content = WHITESPACE_PATTERN.sub(' ', content).strip()
                     
-                    # Get author
-                    author = ""
-                    if hasattr(entry, 'author'):
-                        author = entry.author
-                    elif hasattr(feed.feed, 'title'):
-                        author = feed.feed.title
+                    title = _entry_field(entry, 'title')
                     
                     # Create content item
                     item = EnhancedContentItem(
                         id="",
                         source="rss",
-                        source_url=entry.link if hasattr(entry, 'link') else feed_url,
-                        title=entry.title if hasattr(entry, 'title') else content[:100],
+                        source_url=_entry_field(entry, 'link', default=feed_url),
+                        title=title or content[:100],
                         content=content,
-                        author=author,
+                        author=_entry_field(entry, 'author', default=feed_title),
                         published=pub_date,
-                        primary_category=self._auto_categorize_feed(feed_url, 
-                                                                   getattr(entry, 'title', ''), 
-                                                                   content),
+                        primary_category=self._auto_categorize_feed(feed_url, title, content),
                         source_metadata={
                             'feed_url': feed_url,
-                            'feed_title': getattr(feed.feed, 'title', ''),
+                            'feed_title': feed_title,
                         }
                     )
-                    
-                    # Store in database
-                    if self.db_manager:
-                        success = await self.db_manager.store_content_item(item)
-                        if success:
-                            items.append(item)
-                    else:
-                        items.append(item)
+                    items.append(item)
                         
                 except Exception as e:
                     logger.warning(f"Error parsing RSS entry: {e}")
                     continue
             
+            # Store the whole batch in database
+            if self.db_manager and not await self.db_manager.store_content_items(items):
+                items = []
+            
             logger.info(f"✅ Fetched {len(items)} items from RSS feed")
             
         except Exception as e:
@@ -636,9 +1115,13 @@ class RSSFetcher:
 async def enhanced_fetch_all_sources(
     twitter_usernames: List[str] = None,
     rss_feeds: List[str] = None,
-    max_per_source: int = 20
+    max_per_source: int = 20,
+    http: Optional[aiohttp.ClientSession] = None
 ) -> Dict[str, Any]:
-    """Enhanced multi-source fetching with database storage"""
+    """Enhanced multi-source fetching with database storage
+    
+    Pass a long-lived http session to reuse its connections across calls.
+    """
     
     # Initialize database
     db_manager = DatabaseManager()
@@ -656,6 +1139,7 @@ async def enhanced_fetch_all_sources(
         'twitter_items': 0,
         'rss_items': 0,
         'total_stored': 0,
+        'embedding_failures': 0,
         'processing_time': 0
     }
     
@@ -667,39 +1151,50 @@ async def enhanced_fetch_all_sources(
             logger.info(f"🐦 Fetching from {len(twitter_usernames)} Twitter accounts...")
             twitter_fetcher = TwitterFetcher(db_manager=db_manager)
             
-            for username in twitter_usernames:
-                try:
-                    items = await twitter_fetcher.fetch_user_tweets(username, max_per_source)
-                    all_items.extend(items)
-                    stats['twitter_items'] += len(items)
-                    await asyncio.sleep(1)  # Be nice to Twitter
-                except Exception as e:
-                    logger.error(f"Failed to fetch tweets from {username}: {e}")
-                    continue
+            # Fetch accounts concurrently (bounded by the fetcher's semaphore)
+            try:
+                results = await asyncio.gather(
+                    *(twitter_fetcher.fetch_user_tweets(username, max_per_source) for username in twitter_usernames),
+                    return_exceptions=True
+                )
+            finally:
+                await twitter_fetcher.cleanup()
             
-            await twitter_fetcher.cleanup()
+            for username, items in zip(twitter_usernames, results):
+                if isinstance(items, Exception):
+                    logger.error(f"Failed to fetch tweets from {username}: {items}")
+                    continue
+                all_items.extend(items)
+                stats['twitter_items'] += len(items)
         
         # Fetch RSS content
         if rss_feeds:
             logger.info(f"📰 Fetching from {len(rss_feeds)} RSS feeds...")
-            rss_fetcher = RSSFetcher(db_manager=db_manager)
+            rss_fetcher = RSSFetcher(db_manager=db_manager, http=http)
             
-            for feed_url in rss_feeds:
-                try:
-                    items = await rss_fetcher.fetch_feed_items(feed_url, max_per_source)
-                    all_items.extend(items)
-                    stats['rss_items'] += len(items)
-                except Exception as e:
-                    logger.error(f"Failed to fetch RSS feed {feed_url}: {e}")
+            # Fetch feeds concurrently (bounded by the fetcher's semaphore)
+            results = await asyncio.gather(
+                *(rss_fetcher.fetch_feed_items(feed_url, max_per_source) for feed_url in rss_feeds),
+                return_exceptions=True
+            )
+            
+            for feed_url, items in zip(rss_feeds, results):
+                if isinstance(items, Exception):
+                    logger.error(f"Failed to fetch RSS feed {feed_url}: {items}")
                     continue
+                all_items.extend(items)
+                stats['rss_items'] += len(items)
         
         stats['total_stored'] = len(all_items)
+        stats['embedding_failures'] = db_manager.embedding_failures
         stats['processing_time'] = (datetime.now() - start_time).total_seconds()
         
         logger.info(f"✅ Enhanced fetch completed:")
         logger.info(f"   • Twitter: {stats['twitter_items']} items")
         logger.info(f"   • RSS: {stats['rss_items']} items") 
         logger.info(f"   • Total stored: {stats['total_stored']} items")
+        if stats['embedding_failures']:
+            logger.warning(f"   • Embedding failures: {stats['embedding_failures']} items stored with the default embedding")
         logger.info(f"   • Processing time: {stats['processing_time']:.1f}s")
         
         # Get high-quality content for Notion
@@ -743,17 +1238,67 @@ def fetch_all_sources_sync(twitter_usernames=None, rss_feeds=None, max_per_sourc
     """Synchronous wrapper for multi-source fetching"""
     return asyncio.run(fetch_all_sources(twitter_usernames, rss_feeds, max_per_source))
 
+# Database manager shared by get_filtered_content calls, opened on first use
+_DB: Optional[DatabaseManager] = None
+_DB_LOOP = None
+_DB_LOCK = None
+
+async def _get_db() -> DatabaseManager:
+    """Shared, initialized DatabaseManager for the running event loop"""
+    global _DB, _DB_LOOP, _DB_LOCK
+    
+    # asyncpg pools belong to the event loop that created them
+    loop = asyncio.get_running_loop()
+    if _DB_LOOP is not loop:
+        # Best effort: the old loop may already be gone, but don't leak its pool if not
+        if _DB is not None:
+            with suppress(Exception):
+                await _DB.close()
+        _DB = None
+        _DB_LOOP, _DB_LOCK = loop, asyncio.Lock()
+    
+    async with _DB_LOCK:
+        if _DB is None:
+            db_manager = DatabaseManager()
+            await db_manager.initialize()
+            _DB = db_manager
+    
+    return _DB
+
 # New function specifically for getting high-quality content
 async def get_filtered_content(hours: int = 24, min_score: float = 0.7, limit: int = 25) -> List[Dict]:
     """Get high-quality content from database for Notion"""
-    db_manager = DatabaseManager()
-    await db_manager.initialize()
-    
-    try:
-        return await db_manager.get_high_quality_content(hours, min_score, limit)
-    finally:
-        await db_manager.close()
+    db_manager = await _get_db()
+    return await db_manager.get_high_quality_content(hours, min_score, limit)
+
+# Event loop behind get_filtered_content_sync. asyncio.run would close its
+# loop, and the shared pool with it, after every call.
+_LOOP = None
+
+def _run_sync(coro):
+    """Run coro to completion on the persistent sync-wrapper loop"""
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP.run_until_complete(coro)
+
+@atexit.register
+def _close_db_sync():
+    """Close the shared pool and the sync-wrapper loop at interpreter exit"""
+    if _LOOP is not None and not _LOOP.is_closed():
+        if _DB is not None and _DB_LOOP is _LOOP:
+            _LOOP.run_until_complete(_DB.close())
+        _LOOP.close()
 
 def get_filtered_content_sync(hours: int = 24, min_score: float = 0.7, limit: int = 25) -> List[Dict]:
     """Synchronous wrapper for getting filtered content"""
-    return asyncio.run(get_filtered_content(hours, min_score, limit))
\ No newline at end of file
+    return _run_sync(get_filtered_content(hours, min_score, limit))
+
+async def mark_sent_to_notion(ids: List[str]) -> bool:
+    """Record item IDs sent to Notion so later get_filtered_content calls skip them"""
+    db_manager = await _get_db()
+    return await db_manager.mark_sent_to_notion(ids)
+
+def mark_sent_to_notion_sync(ids: List[str]) -> bool:
+    """Synchronous wrapper for mark_sent_to_notion"""
+    return _run_sync(mark_sent_to_notion(ids))
\ No newline at end of file
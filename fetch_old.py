@@ -1,15 +1,48 @@
 import asyncio
+import atexit
+import contextlib
+import aiohttp
 import feedparser
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from dataclasses import asdict, dataclass
+from itertools import islice
 from typing import List, Optional
 from playwright.async_api import async_playwright
-import hashlib
+from blake3 import blake3
+import orjson
 import logging
+import os
+import re
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# ETag/Last-Modified and parsed items per feed URL, kept between runs
+FEED_CACHE_PATH = os.path.expanduser(os.getenv("FEED_CACHE_PATH", "~/.cache/fetcher/feeds.json"))
+
+# Public timeline that serves a profile's recent tweets without a browser
+SYNDICATION_URL = "https://syndication.twitter.com/srv/timeline-profile/screen-name/{username}"
+NEXT_DATA_PATTERN = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.DOTALL)
+
+# Subresources the scraper never needs to read tweet text
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# Text of each tweet on the page: the tweetText element, or else the first
+# [lang] element with a reasonable amount of text
+EXTRACT_TWEET_TEXTS_JS = r"""
+() => {
+    let tweets = document.querySelectorAll('[data-testid="tweet"]');
+    if (!tweets.length) tweets = document.querySelectorAll('[role="article"]');
+    return Array.from(tweets, tweet => {
+        const textElement = tweet.querySelector('[data-testid="tweetText"]');
+        if (textElement) return textElement.innerText;
+        const langElement = Array.from(tweet.querySelectorAll('[lang]'))
+            .find(el => el.innerText && el.innerText.length > 10);
+        return langElement ? langElement.innerText : '';
+    });
+}
+"""
+
+@dataclass(slots=True)
 class ContentItem:
     """Standardized content item from any source"""
     id: str
@@ -23,23 +56,43 @@ class ContentItem:
     def __post_init__(self):
         # Generate unique ID if not provided
         if not self.id:
-            content_hash = hashlib.md5(
-                f"{self.source}{self.author}{self.title}{self.content}".encode()
-            ).hexdigest()
-            self.id = f"{self.source}_{content_hash[:10]}"
+            hasher = blake3()
+            for part in (self.source, self.author, self.title, self.content):
+                hasher.update(part.encode())
+            self.id = f"{self.source}_{hasher.hexdigest(length=5)}"
 
-class TwitterFetcher:
-    """Playwright-based Twitter scraper"""
+# One browser and context shared by every fetch, kept warm until shutdown()
+_PLAYWRIGHT = None
+_BROWSER = None
+_CONTEXT = None
+_BROWSER_LOOP = None
+_BROWSER_LOCK = None
+
+# Blank pages from the shared context, reused from user to user
+_PAGES = []
+
+async def get_context():
+    """Shared browser context, launched on first use"""
+    global _PLAYWRIGHT, _BROWSER, _CONTEXT, _BROWSER_LOOP, _BROWSER_LOCK
     
-    def __init__(self):
-        self.browser = None
-        self.context = None
+    # Playwright objects belong to the event loop that created them
+    loop = asyncio.get_running_loop()
+    if _BROWSER_LOOP is not loop:
+        # Best effort: the old loop may already be gone, but don't leave Chromium running if not
+        if _BROWSER:
+            with contextlib.suppress(Exception):
+                await _BROWSER.close()
+        if _PLAYWRIGHT:
+            with contextlib.suppress(Exception):
+                await _PLAYWRIGHT.stop()
+        _PLAYWRIGHT = _BROWSER = _CONTEXT = None
+        _PAGES.clear()
+        _BROWSER_LOOP, _BROWSER_LOCK = loop, asyncio.Lock()
     
-    async def _init_browser(self):
-        """Initialize browser with better anti-detection"""
-        if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
+    async with _BROWSER_LOCK:
+        if _CONTEXT is None:
+            _PLAYWRIGHT = await async_playwright().start()
+            _BROWSER = await _PLAYWRIGHT.chromium.launch(
                 headless=False,  # Make visible for debugging
                 args=[
                     '--no-sandbox',
@@ -50,25 +103,97 @@ class TwitterFetcher:
                 ]
             )
             
-            self.context = await self.browser.new_context(
+            context = await _BROWSER.new_context(
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 viewport={'width': 1280, 'height': 720},
                 extra_http_headers={
                     'Accept-Language': 'en-US,en;q=0.9',
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-                }
+                },
+                service_workers='block'  # Requests served by a worker would skip the route below
             )
             
-            await self.context.add_init_script("""
+            # Skip images, video, fonts and stylesheets
+            await context.route("**/*", _route_request)
+            
+            await context.add_init_script("""
                 Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
                 Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
                 Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
             """)
+            _CONTEXT = context
+    
+    return _CONTEXT
+
+async def _route_request(route):
+    """Abort requests for subresources the scraper doesn't need"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def acquire_page():
+    """A free page from the shared context, opening one if none is left"""
+    context = await get_context()
+    return _PAGES.pop() if _PAGES else await context.new_page()
+
+async def release_page(page):
+    """Blank the page and keep it for the next fetch, or close it if it broke"""
+    try:
+        await page.goto('about:blank')
+    except Exception as e:
+        logger.debug(f"Dropping broken page: {e}")
+        with contextlib.suppress(Exception):
+            await page.close()
+    else:
+        _PAGES.append(page)
+
+async def shutdown():
+    """Close the shared browser (call at the end of a batch job)"""
+    global _PLAYWRIGHT, _BROWSER, _CONTEXT
+    
+    if _CONTEXT:
+        await _CONTEXT.close()
+    if _BROWSER:
+        await _BROWSER.close()
+    if _PLAYWRIGHT:
+        await _PLAYWRIGHT.stop()
+    _PLAYWRIGHT = _BROWSER = _CONTEXT = None
+    _PAGES.clear()
+
+# Event loop behind the sync wrappers. asyncio.run would close its loop, and
+# the shared browser with it, after every call.
+_LOOP = None
+
+def _run_sync(coro):
+    """Run coro to completion on the persistent sync-wrapper loop"""
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP.run_until_complete(coro)
+
+@atexit.register
+def _shutdown_sync():
+    """Close the shared browser and the sync-wrapper loop at interpreter exit"""
+    if _LOOP is not None and not _LOOP.is_closed():
+        if _BROWSER_LOOP is _LOOP:
+            _LOOP.run_until_complete(shutdown())
+        _LOOP.close()
+
+class TwitterFetcher:
+    """Playwright-based Twitter scraper"""
+    
+    def __init__(self, max_concurrency: int = 3):
+        self._sem = asyncio.Semaphore(max_concurrency)
     
     async def fetch_user_tweets(self, username: str, max_tweets: int = 20) -> List[ContentItem]:
+        """Fetch tweets from a single user, at most max_concurrency users at a time"""
+        async with self._sem:
+            return await self._fetch_user_tweets_impl(username, max_tweets)
+    
+    async def _fetch_user_tweets_impl(self, username: str, max_tweets: int) -> List[ContentItem]:
         """Fetch tweets from a single user with better error handling"""
-        await self._init_browser()
-        page = await self.context.new_page()
+        page = await acquire_page()
         items = []
         
         try:
@@ -118,59 +243,39 @@ class TwitterFetcher:
             
             # Rest of the scraping logic stays the same...
             tweet_count = 0
+            seen_content = set()
             last_height = 0
             scroll_attempts = 0
             
             while tweet_count < max_tweets and scroll_attempts < 5:  # Reduced scrolls
-                tweets = await page.query_selector_all('[data-testid="tweet"]')
-                
-                if not tweets:  # Try alternative selector
-                    tweets = await page.query_selector_all('[role="article"]')
+                # Pull every tweet's text in one round trip to the browser
+                texts = await page.evaluate(EXTRACT_TWEET_TEXTS_JS)
                 
-                for tweet in tweets:
+                for text in texts:
                     if tweet_count >= max_tweets:
                         break
                     
-                    try:
-                        # Extract tweet text - try multiple approaches
-                        text = ""
-                        
-                        # Try main tweet text selector
-                        text_element = await tweet.query_selector('[data-testid="tweetText"]')
-                        if text_element:
-                            text = await text_element.inner_text()
-                        else:
-                            # Try alternative text extraction
-                            text_elements = await tweet.query_selector_all('[lang]')
-                            if text_elements:
-                                for el in text_elements:
-                                    el_text = await el.inner_text()
-                                    if el_text and len(el_text) > 10:  # Reasonable length
-                                        text = el_text
-                                        break
-                        
-                        if not text or len(text.strip()) < 5:
-                            continue
-                        
-                        # Create simplified content item
-                        item = ContentItem(
-                            id="",
-                            source="twitter",
-                            source_url=f"https://twitter.com/{username}",
-                            title=f"Tweet by @{username}",
-                            content=text,
-                            author=username,
-                            published=datetime.now()  # Use current time for now
-                        )
-                        
-                        # Avoid duplicates
-                        if not any(existing.content == text for existing in items):
-                            items.append(item)
-                            tweet_count += 1
-                            print(f"Found tweet {tweet_count}: {text[:50]}...")
-                            
-                    except Exception as e:
+                    if not text or len(text.strip()) < 5:
                         continue
+                    
+                    # Avoid duplicates
+                    if text in seen_content:
+                        continue
+                    seen_content.add(text)
+                    
+                    # Create simplified content item
+                    item = ContentItem(
+                        id="",
+                        source="twitter",
+                        source_url=f"https://twitter.com/{username}",
+                        title=f"Tweet by @{username}",
+                        content=text,
+                        author=username,
+                        published=datetime.now()  # Use current time for now
+                    )
+                    items.append(item)
+                    tweet_count += 1
+                    print(f"Found tweet {tweet_count}: {text[:50]}...")
                 
                 if tweet_count >= max_tweets:
                     break
@@ -188,77 +293,222 @@ class TwitterFetcher:
         except Exception as e:
             print(f"Error scraping {username}: {e}")
         finally:
-            await page.close()
+            await release_page(page)
         
         print(f"Successfully scraped {len(items)} tweets from @{username}")
         return items
 
     
     async def cleanup(self):
-        """Clean up browser resources"""
-        if self.browser:
-            await self.browser.close()
+        """Release this fetcher; the shared browser stays up until shutdown()"""
+    
+def _parse_tweet_time(created_at: Optional[str]) -> datetime:
+    """Naive UTC datetime from a Twitter created_at string, or now if missing"""
+    if not created_at:
+        return datetime.now()
+    published = datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y')
+    return published.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _timeline_tweets(entries):
+    """(tweet, text) for each syndication timeline entry with new, non-trivial text"""
+    seen_content = set()
+    for entry in entries:
+        tweet = (entry.get('content') or {}).get('tweet')
+        if not tweet:
+            continue
+        
+        text = tweet.get('full_text') or tweet.get('text')
+        if not text or len(text.strip()) < 5 or text in seen_content:
+            continue
+        seen_content.add(text)
+        
+        yield tweet, text
+
+class TwitterSyndicationFetcher:
+    """Browserless Twitter fetcher reading the public syndication timeline"""
+    
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+    
+    async def fetch_user_tweets(self, username: str, max_tweets: int = 20) -> List[ContentItem]:
+        """Fetch a user's recent tweets, or [] if the timeline isn't available"""
+        items = []
+        
+        try:
+            async with self.session.get(
+                SYNDICATION_URL.format(username=username),
+                params={'showReplies': 'false'},
+                headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+            ) as response:
+                response.raise_for_status()
+                if response.content_type == 'application/json':
+                    data = await response.json()
+                else:
+                    # The timeline page embeds its data as Next.js page props
+                    match = NEXT_DATA_PATTERN.search(await response.text())
+                    data = orjson.loads(match.group(1))['props']['pageProps'] if match else {}
+            
+            entries = data.get('timeline', {}).get('entries', [])
+            for tweet, text in islice(_timeline_tweets(entries), max_tweets):
+                items.append(ContentItem(
+                    id="",
+                    source="twitter",
+                    source_url=f"https://twitter.com/{username}/status/{tweet['id_str']}" if tweet.get('id_str') else f"https://twitter.com/{username}",
+                    title=f"Tweet by @{username}",
+                    content=text,
+                    author=username,
+                    published=_parse_tweet_time(tweet.get('created_at'))
+                ))
+            
+        except Exception as e:
+            logger.warning(f"Syndication timeline unavailable for {username}: {e}")
+        
+        return items
+
+def _item_to_cache(item: ContentItem) -> dict:
+    """JSON-friendly form of a ContentItem for the feed cache"""
+    return {**asdict(item), 'published': item.published.isoformat()}
+
+def _item_from_cache(data: dict) -> ContentItem:
+    """ContentItem back from its feed cache form"""
+    return ContentItem(**{**data, 'published': datetime.fromisoformat(data['published'])})
+
+def _entry_field(entry, *names, default=""):
+    """First truthy attribute of a feedparser entry among names, else default"""
+    for name in names:
+        value = getattr(entry, name, None)
+        if value:
+            return value
+    return default
 
 class RSSFetcher:
     """RSS feed fetcher"""
     
-    def fetch_feed_items(self, feed_url: str, max_items: int = 20) -> List[ContentItem]:
-        """Fetch items from RSS feed"""
+    def __init__(self, cache_path: str = FEED_CACHE_PATH):
+        self.cache_path = cache_path
+        self._feed_cache = self._load_cache()
+    
+    def _load_cache(self) -> dict:
+        """Feed cache saved by an earlier run, or an empty one"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache(self):
+        """Write the feed cache, replacing the old file in one step"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(self._feed_cache))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save feed cache {self.cache_path}: {e}")
+    
+    async def fetch_all(self, feed_urls: List[str], max_items: int = 20) -> List[ContentItem]:
+        """Fetch several feeds concurrently over one HTTP session"""
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15)) as session:
+            results = await asyncio.gather(
+                *(self.fetch_feed_items(session, feed_url, max_items) for feed_url in feed_urls)
+            )
+        self._save_cache()
+        return [item for items in results for item in items]
+    
+    async def fetch_feed_items(self, session: aiohttp.ClientSession, feed_url: str, max_items: int = 20) -> List[ContentItem]:
+        """Fetch items from RSS feed, reusing the cached items if it hasn't changed"""
         items = []
         
         try:
-            feed = feedparser.parse(feed_url)
+            # Conditional GET, as long as the cached items cover max_items
+            cached = self._feed_cache.get(feed_url)
+            headers = {}
+            if cached and cached['max_items'] >= max_items:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['modified']:
+                    headers['If-Modified-Since'] = cached['modified']
             
-            for i, entry in enumerate(feed.entries[:max_items]):
+            async with session.get(feed_url, headers=headers) as response:
+                if response.status == 304:
+                    return [_item_from_cache(data) for data in cached['items'][:max_items]]
+                
+                response.raise_for_status()
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                modified = response.headers.get('Last-Modified')
+            
+            # Parsing is CPU-bound; keep it off the event loop
+            feed = await asyncio.get_running_loop().run_in_executor(None, feedparser.parse, body)
+            
+            feed_title = _entry_field(feed.feed, 'title')
+            _datetime = datetime
+            
+            for entry in feed.entries[:max_items]:
                 # Parse date
-                pub_date = datetime.now()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6])
+                parsed = _entry_field(entry, 'published_parsed', 'updated_parsed', default=None)
+                pub_date = _datetime(*parsed[:6]) if parsed else _datetime.now()
                 
                 # Extract content
-                content = ""
-                if hasattr(entry, 'content') and entry.content:
-                    content = entry.content[0].value
-                elif hasattr(entry, 'summary'):
-                    content = entry.summary
-                elif hasattr(entry, 'description'):
-                    content = entry.description
-                
-                # Get author
-                author = entry.author if hasattr(entry, 'author') else feed.feed.title
+                entry_content = _entry_field(entry, 'content')
+                content = entry_content[0].value if entry_content else _entry_field(entry, 'summary', 'description')
                 
                 item = ContentItem(
                     id="",
                     source="rss",
                     source_url=feed_url,
-                    title=entry.title if hasattr(entry, 'title') else "",
+                    title=_entry_field(entry, 'title'),
                     content=content,
-                    author=author,
+                    author=_entry_field(entry, 'author', default=feed_title),
                     published=pub_date
                 )
                 items.append(item)
+            
+            if etag or modified:
+                self._feed_cache[feed_url] = {
+                    'etag': etag,
+                    'modified': modified,
+                    'max_items': max_items,
+                    'items': [_item_to_cache(item) for item in items]
+                }
                 
         except Exception as e:
             logger.error(f"Error parsing RSS feed {feed_url}: {e}")
         
         return items
 
+async def _fetch_twitter_users(usernames: List[str], max_tweets: int) -> List[ContentItem]:
+    """Fetch several users concurrently; the fetcher's semaphore keeps it polite"""
+    twitter_fetcher = TwitterFetcher()
+    all_items = []
+    
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15)) as session:
+        syndication_fetcher = TwitterSyndicationFetcher(session)
+        
+        async def fetch_user(username):
+            # Only start a browser when the syndication timeline comes back empty
+            items = await syndication_fetcher.fetch_user_tweets(username, max_tweets)
+            return items or await twitter_fetcher.fetch_user_tweets(username, max_tweets)
+        
+        results = await asyncio.gather(
+            *(fetch_user(username) for username in usernames),
+            return_exceptions=True
+        )
+    
+    for username, items in zip(usernames, results):
+        if isinstance(items, Exception):
+            logger.error(f"Failed to fetch tweets from {username}: {items}")
+            continue
+        all_items.extend(items)
+    
+    return all_items
+
 # Updated functions to maintain compatibility with your existing code
 async def fetch_tweets(usernames=None, max_tweets=20):
     """Updated fetch_tweets function using Playwright"""
     usernames = usernames or ["paulg", "sama", "naval"]
-    twitter_fetcher = TwitterFetcher()
-    all_items = []
-    
-    try:
-        for username in usernames:
-            items = await twitter_fetcher.fetch_user_tweets(username, max_tweets)
-            all_items.extend(items)
-            await asyncio.sleep(1)  # Be nice to Twitter
-    finally:
-        await twitter_fetcher.cleanup()
+    all_items = await _fetch_twitter_users(usernames, max_tweets)
     
     # Return just the content strings to maintain compatibility
     return [item.content for item in all_items]
@@ -268,33 +518,21 @@ async def fetch_all_sources(twitter_usernames=None, rss_feeds=None, max_per_sour
     twitter_usernames = twitter_usernames or ["paulg", "sama", "naval"]
     rss_feeds = rss_feeds or []
     
-    all_items = []
-    
-    # Fetch Twitter
+    # Fetch Twitter and RSS at the same time
+    tasks = []
     if twitter_usernames:
-        twitter_fetcher = TwitterFetcher()
-        try:
-            for username in twitter_usernames:
-                items = await twitter_fetcher.fetch_user_tweets(username, max_per_source)
-                all_items.extend(items)
-                await asyncio.sleep(1)
-        finally:
-            await twitter_fetcher.cleanup()
-    
-    # Fetch RSS
+        tasks.append(_fetch_twitter_users(twitter_usernames, max_per_source))
     if rss_feeds:
-        rss_fetcher = RSSFetcher()
-        for feed_url in rss_feeds:
-            items = rss_fetcher.fetch_feed_items(feed_url, max_per_source)
-            all_items.extend(items)
+        tasks.append(RSSFetcher().fetch_all(rss_feeds, max_per_source))
     
-    return all_items
+    results = await asyncio.gather(*tasks)
+    return [item for items in results for item in items]
 
 # Convenience function for async execution
 def fetch_tweets_sync(usernames=None, max_tweets=20):
     """Synchronous wrapper for existing code compatibility"""
-    return asyncio.run(fetch_tweets(usernames, max_tweets))
+    return _run_sync(fetch_tweets(usernames, max_tweets))
 
 def fetch_all_sources_sync(twitter_usernames=None, rss_feeds=None, max_per_source=20):
     """Synchronous wrapper for multi-source fetching"""
-    return asyncio.run(fetch_all_sources(twitter_usernames, rss_feeds, max_per_source))
\ No newline at end of file
+    return _run_sync(fetch_all_sources(twitter_usernames, rss_feeds, max_per_source))
\ No newline at end of file
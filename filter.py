@@ -1,4 +1,22 @@
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+noise_keywords = ["promo", "discount", "webinar", "launch"]
+
+# One case-insensitive pass over the text for all noise keywords
+NOISE_PATTERN = re.compile("|".join(map(re.escape, noise_keywords)), re.IGNORECASE)
+
 def is_signal(text):
-    text = text.lower()
-    noise_keywords = ["promo", "discount", "webinar", "launch"]
-    return not any(word in text for word in noise_keywords)
+    return NOISE_PATTERN.search(text) is None
+
+def filter_signals(texts):
+    """Texts without noise keywords, found with one regex scan over the whole batch"""
+    texts = list(texts)
+    
+    # Join with a separator no keyword contains, so matches can't span two texts
+    starts = list(accumulate((len(text) + 1 for text in texts), initial=0))
+    corpus = "\0".join(texts)
+    noisy = {bisect_right(starts, match.start()) - 1 for match in NOISE_PATTERN.finditer(corpus)}
+    
+    return [text for i, text in enumerate(texts) if i not in noisy]
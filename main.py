@@ -1,12 +1,71 @@
-from fetch import fetch_tweets_sync, fetch_all_sources_sync, get_filtered_content_sync
-from filter import is_signal
-from output import send_to_notion
+import asyncio
+from fetch import DatabaseManager, TwitterFetcher, get_filtered_content_sync, mark_sent_to_notion_sync
+from dedup import SeenFilter
+from filter import filter_signals
+from output import send_queue_to_notion, send_to_notion_sync
+
+NOTION_WORKERS = 4
+
+async def stream_tweets_to_notion(usernames=None, max_tweets=20):
+    """Fetch, filter and send tweets as a pipeline, so Notion writes start while scraping continues"""
+    usernames = usernames or ["paulg", "sama", "naval"]
+    queue = asyncio.Queue(maxsize=64)
+    
+    # Skip tweets handled on an earlier run: sent to Notion, or filtered out as noise
+    seen = SeenFilter.load()
+    ids_by_text = {}
+    
+    db_manager = DatabaseManager()
+    await db_manager.initialize()
+    twitter_fetcher = TwitterFetcher(db_manager=db_manager)
+    
+    async def produce(username):
+        items = await twitter_fetcher.fetch_user_tweets(username, max_tweets)
+        items = [item for item in items if item.id not in seen]
+        signals = filter_signals(item.content for item in items)
+        
+        signal_texts = set(signals)
+        for item in items:
+            if item.content in signal_texts:
+                ids_by_text.setdefault(item.content, []).append(item.id)
+            else:
+                seen.add(item.id)  # noise is dropped the same way on every run
+        
+        for text in signals:
+            await queue.put(text)
+    
+    async def produce_all():
+        try:
+            results = await asyncio.gather(*(produce(username) for username in usernames), return_exceptions=True)
+            for username, result in zip(usernames, results):
+                if isinstance(result, Exception):
+                    print(f"❌ Failed to fetch tweets from {username}: {result}")
+        finally:
+            await twitter_fetcher.cleanup()
+            # One sentinel per consumer
+            for _ in range(NOTION_WORKERS):
+                await queue.put(None)
+    
+    try:
+        _, results = await asyncio.gather(produce_all(), send_queue_to_notion(queue, workers=NOTION_WORKERS))
+        
+        # Only tweets Notion accepted are skipped next time; failed ones are retried
+        for text, added in results:
+            if added:
+                for item_id in ids_by_text.get(text, ()):
+                    seen.add(item_id)
+    finally:
+        seen.save()
+        await db_manager.close()
 
 def main():
-    """Original main function - still works exactly the same"""
-    tweets = fetch_tweets_sync()
-    signal = [t for t in tweets if is_signal(t)]
-    send_to_notion(signal)
+    """Stream new, non-noise tweets from the default accounts to Notion
+    
+    Needs SUPABASE_DB_URL (tweets are stored through DatabaseManager), the
+    Notion credentials, and write access to SEEN_FILTER_PATH, where the IDs
+    of tweets already handled are kept between runs.
+    """
+    asyncio.run(stream_tweets_to_notion())
 
 def main_multi_source():
     """Enhanced main function using intelligent filtering"""
@@ -24,10 +83,15 @@ def main_multi_source():
     
     # Send to Notion (these are already smart-filtered)
     if high_quality_items:
-        # Convert to strings for your existing send_to_notion function
+        # Convert to strings for your existing send_to_notion_sync function
         content_strings = [item['content'] for item in high_quality_items]
-        send_to_notion(content_strings)
-        print(f"📋 Sent {len(content_strings)} items to Notion")
+        added = send_to_notion_sync(content_strings)
+        
+        # Only items Notion accepted are skipped on the next run
+        sent_ids = [item['id'] for item, ok in zip(high_quality_items, added) if ok]
+        print(f"📋 Sent {len(sent_ids)} items to Notion")
+        if not mark_sent_to_notion_sync(sent_ids):
+            print("⚠️  Could not record the sent items; they may be sent again next run")
     else:
         print("ℹ️  No new high-quality content found")
 
@@ -1,68 +1,126 @@
+import asyncio
 import os
-from notion_client import Client
+from notion_client import AsyncClient
 from dotenv import load_dotenv
 
 load_dotenv()
-notion = Client(auth=os.getenv("NOTION_API_KEY"))
 
-def send_to_notion(posts):
-    """Send posts to Notion - works with both old format (strings) and new format (ContentItem objects)"""
-    db_id = os.getenv("NOTION_DATABASE_ID")
+# Notion allows about 3 requests per second per integration; a few more in
+# flight hides the round trip without going over the average rate
+NOTION_RATE_PER_SEC = 3
+NOTION_CONCURRENCY = 8
+
+class _RateLimit:
+    """Caps requests in flight and spaces their starts 1/rate_per_sec apart"""
+    
+    def __init__(self, concurrency=NOTION_CONCURRENCY, rate_per_sec=NOTION_RATE_PER_SEC):
+        self._sem = asyncio.Semaphore(concurrency)
+        self._interval = 1 / rate_per_sec
+        self._next_start = 0.0
     
-    for post in posts:
+    async def __aenter__(self):
+        await self._sem.acquire()
         try:
-            # Handle both old format (strings) and new format (ContentItem objects)
-            if isinstance(post, str):
-                # Old format - just a string
-                notion.pages.create(
-                    parent={"database_id": db_id},
-                    properties={
-                        "Title": {
-                            "title": [{"text": {"content": post[:100]}}]  # First 100 chars as title
-                        },
-                        "Content": {
-                            "rich_text": [{"text": {"content": post}}]
-                        },
-                        "Source": {
-                            "select": {"name": "Twitter"}  # Default to Twitter for old format
-                        },
-                        "Author": {
-                            "rich_text": [{"text": {"content": "Unknown"}}]
-                        }
-                    }
-                )
-            else:
-                # New format - ContentItem object
-                notion.pages.create(
-                    parent={"database_id": db_id},
-                    properties={
-                        "Title": {
-                            "title": [{"text": {"content": post.title[:100] if post.title else post.content[:100]}}]
-                        },
-                        "Source": {
-                            "select": {"name": post.source.title()}  # twitter -> Twitter
-                        },
-                        "Author": {
-                            "rich_text": [{"text": {"content": post.author}}]
-                        },
-                        "Content": {
-                            "rich_text": [{"text": {"content": post.content}}]
-                        },
-                        "URL": {
-                            "url": post.source_url if post.source_url.startswith('http') else None
-                        },
-                        "Date": {
-                            "date": {"start": post.published.isoformat()}
-                        }
-                    }
-                )
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            await asyncio.sleep(start - now)
+        except BaseException:
+            self._sem.release()
+            raise
+    
+    async def __aexit__(self, *exc_info):
+        self._sem.release()
+
+def _page_properties(post):
+    """Notion page properties for a post - works with both old format (strings) and new format (ContentItem objects)"""
+    if isinstance(post, str):
+        # Old format - just a string
+        return {
+            "Title": {
+                "title": [{"text": {"content": post[:100]}}]  # First 100 chars as title
+            },
+            "Content": {
+                "rich_text": [{"text": {"content": post}}]
+            },
+            "Source": {
+                "select": {"name": "Twitter"}  # Default to Twitter for old format
+            },
+            "Author": {
+                "rich_text": [{"text": {"content": "Unknown"}}]
+            }
+        }
+    
+    # New format - ContentItem object
+    return {
+        "Title": {
+            "title": [{"text": {"content": post.title[:100] if post.title else post.content[:100]}}]
+        },
+        "Source": {
+            "select": {"name": post.source.title()}  # twitter -> Twitter
+        },
+        "Author": {
+            "rich_text": [{"text": {"content": post.author}}]
+        },
+        "Content": {
+            "rich_text": [{"text": {"content": post.content}}]
+        },
+        "URL": {
+            "url": post.source_url if post.source_url.startswith('http') else None
+        },
+        "Date": {
+            "date": {"start": post.published.isoformat()}
+        }
+    }
+
+async def _create_page(notion, rate_limit, db_id, post):
+    """Create one Notion page under the rate limit, returning whether it worked"""
+    async with rate_limit:
+        try:
+            await notion.pages.create(
+                parent={"database_id": db_id},
+                properties=_page_properties(post)
+            )
             print(f"✅ Added to Notion: {post[:50] if isinstance(post, str) else post.title[:50]}...")
-            
+            return True
+        
         except Exception as e:
             print(f"❌ Error adding to Notion: {e}")
-            # Continue with other posts even if one fails
-            continue
+            # Other posts are still sent even if one fails
+            return False
+
+async def send_to_notion(posts):
+    """Send posts to Notion concurrently within its rate limit, returning which ones were added"""
+    db_id = os.getenv("NOTION_DATABASE_ID")
+    rate_limit = _RateLimit()
+    
+    async with AsyncClient(auth=os.getenv("NOTION_API_KEY")) as notion:
+        return await asyncio.gather(
+            *(_create_page(notion, rate_limit, db_id, post) for post in posts)
+        )
+
+async def send_queue_to_notion(queue, workers=NOTION_CONCURRENCY):
+    """Send posts to Notion as they arrive on queue; each worker stops at a None sentinel
+    
+    Returns (post, added) pairs for every post taken off the queue.
+    """
+    db_id = os.getenv("NOTION_DATABASE_ID")
+    rate_limit = _RateLimit()
+    results = []
+    
+    async def worker(notion):
+        while (post := await queue.get()) is not None:
+            results.append((post, await _create_page(notion, rate_limit, db_id, post)))
+    
+    async with AsyncClient(auth=os.getenv("NOTION_API_KEY")) as notion:
+        await asyncio.gather(*(worker(notion) for _ in range(workers)))
+    
+    return results
+
+def send_to_notion_sync(posts):
+    """Synchronous wrapper for send_to_notion"""
+    return asyncio.run(send_to_notion(posts))
 
 def send_items_to_notion(items):
     """Send ContentItem objects to Notion with full metadata"""
-    send_to_notion(items)  # Uses the same function, just with ContentItem objects
\ No newline at end of file
+    send_to_notion_sync(items)  # Uses the same function, just with ContentItem objects
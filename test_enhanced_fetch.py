@@ -2,7 +2,10 @@
 Test script for your enhanced fetch system
 """
 import asyncio
+import aiohttp
+from collections import Counter
 from fetch import enhanced_fetch_all_sources, get_filtered_content_sync
+from test_supabase import close_pool, get_pool, run_prepared, use_uvloop
 
 async def test_enhanced_system():
     """Test the new enhanced fetch system"""
@@ -14,11 +17,16 @@ async def test_enhanced_system():
     print("1️⃣ Testing enhanced fetch with small dataset...")
     
     try:
-        result = await enhanced_fetch_all_sources(
-            twitter_usernames=["sama", "naval"],  # Just 2 accounts for testing
-            rss_feeds=["https://techcrunch.com/feed/"],  # Just 1 feed
-            max_per_source=5  # Only 5 items each
-        )
+        # One HTTP session for the whole run, so connections are reused across sources
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+        ) as http:
+            result = await enhanced_fetch_all_sources(
+                twitter_usernames=["sama", "naval"],  # Just 2 accounts for testing
+                rss_feeds=["https://techcrunch.com/feed/"],  # Just 1 feed
+                max_per_source=5,  # Only 5 items each
+                http=http
+            )
         
         print(f"   ✅ Fetched {result['stats']['total_stored']} items total")
         print(f"   📊 Twitter: {result['stats']['twitter_items']} items")
@@ -52,18 +60,17 @@ async def test_enhanced_system():
         
         if filtered_items:
             print(f"   📊 Quality breakdown:")
-            categories = {}
-            scores = []
-            
+            # One pass for both the category counts and the score total
+            categories = Counter()
+            total_score = 0.0
             for item in filtered_items:
-                cat = item.get('primary_category', 'None')
-                categories[cat] = categories.get(cat, 0) + 1
-                scores.append(item.get('relevance_score', 0))
+                categories[item.get('primary_category', 'None')] += 1
+                total_score += item.get('relevance_score', 0.0)
             
             for cat, count in categories.items():
                 print(f"      • {cat}: {count} items")
             
-            avg_score = sum(scores) / len(scores) if scores else 0
+            avg_score = total_score / len(filtered_items)
             print(f"   📈 Average quality score: {avg_score:.2f}")
         
     except Exception as e:
@@ -74,31 +81,25 @@ async def test_enhanced_system():
     print(f"\n3️⃣ Testing database integration...")
     
     try:
-        from fetch import DatabaseManager
-        
-        db_manager = DatabaseManager()
-        await db_manager.initialize()
+        # Plain pool: DatabaseManager.initialize() would also load every rated embedding
+        pool = await get_pool()
         
-        # Check recent content count
-        async with db_manager.db_pool.acquire() as conn:
-            recent_count = await conn.fetchval("""
-                SELECT COUNT(*) FROM content_items 
-                WHERE scraped_at > NOW() - INTERVAL '1 hour'
-            """)
-            
-            total_count = await conn.fetchval("SELECT COUNT(*) FROM content_items")
-            
-            rated_count = await conn.fetchval("""
-                SELECT COUNT(*) FROM content_items WHERE user_feedback IS NOT NULL
-            """)
+        # Recent, total and rated counts in one query
+        async with pool.acquire() as conn:
+            counts = await run_prepared(conn, """
+                SELECT COUNT(*) FILTER (WHERE scraped_at > NOW() - INTERVAL '1 hour') AS recent,
+                       COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE user_feedback IS NOT NULL) AS rated
+                FROM content_items
+            """, method='fetchrow')
         
-        await db_manager.close()
+        await close_pool()
         
         print(f"   ✅ Database connection working")
         print(f"   📊 Content in database:")
-        print(f"      • Last hour: {recent_count} items")
-        print(f"      • Total: {total_count} items")
-        print(f"      • User-rated: {rated_count} items")
+        print(f"      • Last hour: {counts['recent']} items")
+        print(f"      • Total: {counts['total']} items")
+        print(f"      • User-rated: {counts['rated']} items")
         
     except Exception as e:
         print(f"   ❌ Database test failed: {e}")
@@ -114,6 +115,8 @@ async def test_enhanced_system():
     return True
 
 if __name__ == "__main__":
+    use_uvloop()
+    
     success = asyncio.run(test_enhanced_system())
     
     if success:
@@ -5,33 +5,164 @@ Run this to make sure everything is connected properly
 
 import asyncio
 import asyncpg
+import numpy as np
 from pgvector.asyncpg import register_vector
+import orjson
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+from fetch import (
+    DB_STATEMENT_CACHE_SIZE, EMBEDDING_DIMENSIONS, EMBEDDING_TABLES, EMBEDDING_TYPE_SQL,
+    configure_hnsw_params, migrate_embeddings_to_halfvec
+)
 
 load_dotenv()
 
+# Dummy embedding for the test record, built once at halfvec (fp16) precision
+TEST_EMBEDDING = np.full(EMBEDDING_DIMENSIONS, 0.1, dtype=np.float16)
+TEST_EMBEDDING.flags.writeable = False
+
+# Settings for building the HNSW index. Keep the memory well under the
+# database's RAM; small Supabase instances have 1GB or less.
+HNSW_BUILD_WORKERS = int(os.getenv("HNSW_BUILD_WORKERS", "2"))
+HNSW_BUILD_MEMORY = os.getenv("HNSW_BUILD_MEMORY", "256MB")
+
+# The content_analysis smoke query must finish within this budget, and may
+# only sequentially scan tables the planner expects to be small
+CONTENT_ANALYSIS_BUDGET_MS = 100
+SEQ_SCAN_MAX_ROWS = 1000
+
+def _plan_nodes(plan):
+    """Every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from _plan_nodes(child)
+
+# Columns written by insert_content_items, in row tuple order; the id
+# comes from the column default
+TEST_COLUMNS = ['source', 'title', 'content', 'author', 'published', 'embedding', 'relevance_score']
+
+INSERT_CONTENT_SQL = """
+    INSERT INTO content_items 
+    (source, title, content, author, published, embedding, relevance_score)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
+# Batches this size and up are loaded with COPY instead of INSERT
+COPY_MIN_ROWS = 8
+
+def use_uvloop():
+    """Run later event loops on uvloop, which makes asyncpg round trips cheaper, if installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Connection pool shared by the tests, opened on first use
+_pool = None
+
+async def get_pool():
+    """Shared pool; each connection gets the pgvector codec once, when it is opened"""
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            os.getenv("SUPABASE_DB_URL"),
+            init=register_vector,
+            min_size=2,
+            max_size=10,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE
+        )
+    return _pool
+
+async def close_pool():
+    """Close the shared pool; call before the event loop that opened it ends"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+# Prepared statements by SQL text, for the connection in _stmt_conn
+_stmt_cache = {}
+_stmt_conn = None
+
+async def run_prepared(conn, sql, *args, method='fetch'):
+    """Run sql on conn through a prepared statement, parsed once per connection
+    
+    method is the PreparedStatement method to call (fetch, fetchrow,
+    fetchval or executemany). With DB_STATEMENT_CACHE_SIZE=0 (transaction-mode
+    pooler, which can't keep named statements) it calls the same method on
+    conn instead.
+    """
+    global _stmt_conn
+    if DB_STATEMENT_CACHE_SIZE == 0:
+        return await getattr(conn, method)(sql, *args)
+    
+    if conn is not _stmt_conn:
+        _stmt_cache.clear()
+        _stmt_conn = conn
+    
+    stmt = _stmt_cache.get(sql)
+    if stmt is None:
+        stmt = _stmt_cache[sql] = await conn.prepare(sql)
+    return await getattr(stmt, method)(*args)
+
+async def insert_content_items(conn, rows, returning=False):
+    """Insert row tuples (in TEST_COLUMNS order) into content_items
+    
+    Batches are sent in one round trip. With returning=True the rows are
+    inserted one by one instead and their generated ids are returned, since
+    neither COPY nor executemany can hand them back.
+    """
+    if returning:
+        return [
+            await run_prepared(conn, INSERT_CONTENT_SQL + "RETURNING id", *row, method='fetchval')
+            for row in rows
+        ]
+    
+    if len(rows) >= COPY_MIN_ROWS:
+        await conn.copy_records_to_table('content_items', records=rows, columns=TEST_COLUMNS)
+    else:
+        await run_prepared(conn, INSERT_CONTENT_SQL, rows, method='executemany')
+
 async def test_supabase_connection():
     """Test all aspects of your Supabase setup"""
     
     print("🧪 Testing Supabase Connection...")
     print("=" * 50)
     
+    pool = conn = test_transaction = None
     try:
         # Test 1: Basic connection
         print("1️⃣ Testing database connection...")
-        conn = await asyncpg.connect(os.getenv("SUPABASE_DB_URL"))
-        await register_vector(conn)
+        pool = await get_pool()
+        conn = await pool.acquire()
         print("   ✅ Connected to Supabase successfully!")
         
+        # The table, extension and view probes depend on nothing else, so run
+        # them together on their own pool connections. Each result (or error)
+        # is reported in its own section below.
+        tables, vector_test, analysis = await asyncio.gather(
+            pool.fetch("""
+                SELECT table_name FROM information_schema.tables 
+                WHERE table_schema = 'public' 
+                AND table_name IN ('content_items', 'detailed_ratings', 'learning_patterns', 'system_metrics')
+            """),
+            pool.fetchval("""
+                SELECT EXISTS(
+                    SELECT 1 FROM pg_extension WHERE extname = 'vector'
+                );
+            """),
+            pool.fetchval("EXPLAIN (ANALYZE, FORMAT JSON) SELECT * FROM content_analysis LIMIT 5"),
+            return_exceptions=True
+        )
+        
         # Test 2: Check if tables exist
         print("\n2️⃣ Checking database schema...")
-        tables = await conn.fetch("""
-            SELECT table_name FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name IN ('content_items', 'detailed_ratings', 'learning_patterns', 'system_metrics')
-        """)
+        if isinstance(tables, Exception):
+            print(f"   ❌ Could not list tables: {tables}")
+            tables = []
         
         table_names = [row['table_name'] for row in tables]
         expected_tables = ['content_items', 'detailed_ratings', 'learning_patterns', 'system_metrics']
@@ -42,15 +173,65 @@ async def test_supabase_connection():
             else:
                 print(f"   ❌ Table '{table}' missing")
         
+        # Similarity queries need an HNSW index, or they scan every embedding
+        hnsw_params = configure_hnsw_params(0)
+        if 'content_items' in table_names:
+            vector_count = await conn.fetchval("SELECT COUNT(*) FROM content_items")
+            hnsw_params = configure_hnsw_params(vector_count)
+            
+            # Let the server generate ids for rows inserted without one
+            id_default = await conn.fetchval("""
+                SELECT column_default FROM information_schema.columns
+                WHERE table_schema = 'public' AND table_name = 'content_items' AND column_name = 'id'
+            """)
+            if id_default is None:
+                await conn.execute("ALTER TABLE content_items ALTER COLUMN id SET DEFAULT gen_random_uuid()::text")
+                print("   ✅ content_items.id now defaults to a generated UUID")
+            
+            # fp16 halfvec embeddings halve the bytes every distance computation reads
+            embedding_types = [await conn.fetchval(EMBEDDING_TYPE_SQL, table) for table in EMBEDDING_TABLES]
+            embedding_type = embedding_types[0]  # content_items
+            if 'vector' in embedding_types:
+                print("   ⏳ Converting embeddings to halfvec...")
+                # Indexes built with vector operator classes can't follow the type change
+                for row in await conn.fetch("""
+                    SELECT indexname FROM pg_indexes
+                    WHERE tablename = ANY($1::text[]) AND indexdef ILIKE '%hnsw%'
+                """, list(EMBEDDING_TABLES)):
+                    await conn.execute(f'DROP INDEX IF EXISTS "{row["indexname"]}"')
+                embedding_type = await migrate_embeddings_to_halfvec(conn)
+                print("   ✅ Embeddings stored as halfvec")
+            
+            hnsw_index = await conn.fetchval("""
+                SELECT indexdef FROM pg_indexes
+                WHERE tablename = 'content_items' AND indexdef ILIKE '%hnsw%'
+            """)
+            
+            if hnsw_index:
+                print("   ✅ HNSW index on embeddings exists")
+            else:
+                print("   ⏳ Creating HNSW index on embeddings...")
+                # More workers and memory for the index build, reset afterwards so
+                # they don't stay on the pooled connection
+                await conn.execute(f"SET max_parallel_maintenance_workers = {HNSW_BUILD_WORKERS}")
+                await conn.execute(f"SET maintenance_work_mem = '{HNSW_BUILD_MEMORY}'")
+                try:
+                    # Operator class must match the column type and the <-> (L2) queries
+                    await conn.execute(f"""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS content_items_embedding_hnsw_idx
+                        ON content_items USING hnsw (embedding {embedding_type}_l2_ops)
+                        WITH (m = {hnsw_params['m']}, ef_construction = {hnsw_params['ef_construction']})
+                    """)
+                finally:
+                    await conn.execute("RESET max_parallel_maintenance_workers")
+                    await conn.execute("RESET maintenance_work_mem")
+                print(f"   ✅ Created HNSW index for {vector_count} embeddings (m={hnsw_params['m']}, ef_construction={hnsw_params['ef_construction']})")
+        
         # Test 3: Check vector extension
         print("\n3️⃣ Testing vector extension...")
-        vector_test = await conn.fetchval("""
-            SELECT EXISTS(
-                SELECT 1 FROM pg_extension WHERE extname = 'vector'
-            );
-        """)
-        
-        if vector_test:
+        if isinstance(vector_test, Exception):
+            print(f"   ❌ Could not check for the vector extension: {vector_test}")
+        elif vector_test:
             print("   ✅ Vector extension is enabled")
         else:
             print("   ❌ Vector extension not found")
@@ -58,36 +239,32 @@ async def test_supabase_connection():
         # Test 4: Insert a test record
         print("\n4️⃣ Testing data insertion...")
         
-        # Generate a simple test embedding (normally from OpenAI)
-        test_embedding = [0.1] * 1536  # Dummy embedding
+        # Tests 4-6 run in one transaction that is rolled back at the end, so
+        # the test record never outlives the run, even if a step fails
+        test_transaction = conn.transaction()
+        await test_transaction.start()
         
-        test_id = f"test_{int(datetime.now().timestamp())}"
-        
-        await conn.execute("""
-            INSERT INTO content_items 
-            (id, source, title, content, author, published, embedding, relevance_score)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        """, 
-            test_id,
+        # The server generates the id; RETURNING hands it back in the same round trip
+        [test_id] = await insert_content_items(conn, [(
             "test_source", 
             "Test Article", 
             "This is a test article to verify database functionality",
             "test_user",
             datetime.now(),
-            test_embedding,
+            TEST_EMBEDDING,
             0.75
-        )
+        )], returning=True)
         
         print("   ✅ Successfully inserted test record")
         
         # Test 5: Query the data back
         print("\n5️⃣ Testing data retrieval...")
         
-        result = await conn.fetchrow("""
+        result = await run_prepared(conn, """
             SELECT id, source, title, relevance_score 
             FROM content_items 
             WHERE id = $1
-        """, test_id)
+        """, test_id, method='fetchrow')
         
         if result:
             print(f"   ✅ Retrieved record: {result['title']} (score: {result['relevance_score']})")
@@ -97,27 +274,44 @@ async def test_supabase_connection():
         # Test 6: Test vector similarity (basic)
         print("\n6️⃣ Testing vector similarity...")
         
-        similar = await conn.fetch("""
-            SELECT id, title, (embedding <-> $1) as distance 
-            FROM content_items 
-            WHERE id = $2
-            LIMIT 1
-        """, test_embedding, test_id)
+        # Nearest-neighbour search, so the query goes through the HNSW index
+        async with conn.transaction():
+            await conn.execute(f"SET LOCAL hnsw.ef_search = {hnsw_params['ef_search']}")
+            similar = await run_prepared(conn, """
+                SELECT id, title, (embedding <-> $1) as distance 
+                FROM content_items 
+                ORDER BY embedding <-> $1
+                LIMIT 10
+            """, TEST_EMBEDDING)
         
-        if similar:
-            print(f"   ✅ Vector similarity working (distance: {similar[0]['distance']})")
+        match = next((row for row in similar if row['id'] == test_id), None)
+        if match:
+            print(f"   ✅ Vector similarity working (distance: {match['distance']})")
         else:
             print("   ❌ Vector similarity test failed")
         
         # Test 7: Check the analysis view
         print("\n7️⃣ Testing analysis view...")
+        if isinstance(analysis, Exception):
+            print(f"   ❌ Analysis view query failed: {analysis}")
+            raise analysis
         
-        analysis = await conn.fetch("SELECT * FROM content_analysis LIMIT 5")
-        print(f"   ✅ Analysis view returned {len(analysis)} rows")
+        # EXPLAIN ANALYZE runs the query, so the plan also gives the row count
+        analysis_plan = orjson.loads(analysis)[0]
+        execution_ms = analysis_plan['Execution Time']
+        seq_scans = [
+            node for node in _plan_nodes(analysis_plan['Plan'])
+            if node['Node Type'] == 'Seq Scan' and node['Plan Rows'] >= SEQ_SCAN_MAX_ROWS
+        ]
+        assert not seq_scans, f"content_analysis degraded to seq scan: {seq_scans}"
+        assert execution_ms <= CONTENT_ANALYSIS_BUDGET_MS, (
+            f"content_analysis took {execution_ms:.1f} ms (budget {CONTENT_ANALYSIS_BUDGET_MS} ms)"
+        )
+        print(f"   ✅ Analysis view returned {analysis_plan['Plan']['Actual Rows']} rows in {execution_ms:.1f} ms")
         
         # Clean up test record
-        await conn.execute("DELETE FROM content_items WHERE id = $1", test_id)
-        print("   🧹 Cleaned up test record")
+        await test_transaction.rollback()
+        print("   🧹 Rolled back test record")
         
         # Final summary
         print(f"\n🎉 All tests passed! Your Supabase setup is ready.")
@@ -134,10 +328,27 @@ async def test_supabase_connection():
         
     finally:
         if conn:
-            await conn.close()
+            if test_transaction is not None and conn.is_in_transaction():
+                await test_transaction.rollback()
+            await pool.release(conn)
+        await close_pool()
+
+# Sentences embedded by test_openai_embeddings, all in one request
+EMBEDDING_TEST_INPUTS = [
+    "This is a test sentence for embedding generation",
+    "A second sentence, to check that batched inputs come back in order",
+]
+
+# OpenAI client reused between calls, along with its HTTP connection pool
+_openai_client = None
 
 async def test_openai_embeddings():
-    """Test OpenAI embeddings if API key is provided"""
+    """Test OpenAI embeddings if RUN_OPENAI_TESTS is set and an API key is provided"""
+    global _openai_client
+    
+    if not os.getenv("RUN_OPENAI_TESTS"):
+        print("\n⚠️  RUN_OPENAI_TESTS not set - skipping embeddings test")
+        return
     
     openai_key = os.getenv("OPENAI_API_KEY")
     
@@ -151,20 +362,23 @@ async def test_openai_embeddings():
     try:
         from openai import AsyncOpenAI
         
-        client = AsyncOpenAI(api_key=openai_key)
+        if _openai_client is None:
+            _openai_client = AsyncOpenAI(api_key=openai_key)
         
-        response = await client.embeddings.create(
+        response = await _openai_client.embeddings.create(
             model="text-embedding-3-small",
-            input="This is a test sentence for embedding generation"
+            input=EMBEDDING_TEST_INPUTS
         )
         
-        embedding = response.data[0].embedding
-        print(f"   ✅ Generated embedding with {len(embedding)} dimensions")
+        for item in response.data:
+            print(f"   ✅ Generated embedding {item.index + 1}/{len(EMBEDDING_TEST_INPUTS)} with {len(item.embedding)} dimensions")
         
     except Exception as e:
         print(f"   ❌ OpenAI embeddings test failed: {e}")
         print(f"   Make sure your OPENAI_API_KEY is valid")
 
 if __name__ == "__main__":
+    use_uvloop()
+    
     asyncio.run(test_supabase_connection())
     asyncio.run(test_openai_embeddings())
\ No newline at end of file